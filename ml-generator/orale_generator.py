@@ -1,18 +1,202 @@
 import json
 import os
 import argparse
-from openai import OpenAI
-from typing import List, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import httpx
+import ijson
+import itertools
+import math
+import openai
+import orjson
+import random
+import tiktoken
+from aiolimiter import AsyncLimiter
+from collections import defaultdict
+from openai import OpenAI, AsyncOpenAI
+from typing import List, Dict, Optional, Tuple, Iterator
 import time
 import re
 from pathlib import Path
 
+
+class DiskCache:
+    """
+    File-backed cache of generated responses, keyed by a SHA-256 of the request payload
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        if cache_dir is None:
+            cache_dir = os.path.join(Path.home(), ".cache", "tcf_orale")
+        self.dir = cache_dir
+    
+    @staticmethod
+    def key_for(payload: Dict) -> str:
+        """Hash a request payload (model, messages, temperature, max_tokens) into a cache key."""
+        payload_json = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload_json.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir, key[:2], key)
+    
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def set(self, key: str, value: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+
+class SemanticCache:
+    """
+    Per-task embedding index of generated responses, used to find a cached response for a
+    structurally similar topic (e.g. the same scenario with a different keyword)
+    """
+    
+    def __init__(self, cache_dir: str, threshold: float = 0.92):
+        self.path = os.path.join(cache_dir, "semantic_index.json")
+        self.threshold = threshold
+        self.entries: Dict[str, List[Dict]] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Could not load semantic cache: {e}. Starting empty.")
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return [x / norm for x in embedding]
+    
+    def lookup(self, task_key: str, embedding: List[float]) -> Optional[Dict]:
+        """Return the most similar cached entry for the task if its cosine similarity reaches the threshold."""
+        query = self._normalize(embedding)
+        best, best_score = None, self.threshold
+        for entry in self.entries.get(task_key, []):
+            score = sum(a * b for a, b in zip(query, entry["embedding"]))
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+    
+    def add(self, task_key: str, topic_content: str, embedding: List[float], response: str) -> None:
+        self.entries.setdefault(task_key, []).append({
+            "topic": topic_content,
+            "embedding": self._normalize(embedding),
+            "response": response
+        })
+    
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+
+
+# Section headers a generated document must contain (see OUTPUT FORMAT in the prompt files)
+EXPECTED_SECTIONS = {
+    'tache_2': [
+        re.compile(r'^#{1,4}.*Conversation simulée', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'^#{1,4}.*Expressions et vocabulaire', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'^#{1,4}.*Conseils', re.MULTILINE | re.IGNORECASE),
+    ],
+    'tache_3': [
+        re.compile(r'^#{1,4}.*Monologue argumentatif', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'^#{1,4}.*Introduction', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'^#{1,4}.*Développement', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'^#{1,4}.*Conclusion', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'^#{1,4}.*Expressions argumentatives', re.MULTILINE | re.IGNORECASE),
+    ],
+}
+MIN_OUTPUT_CHARS = 800
+
+# Metadata header written before each generated document (filled with str.format_map)
+_META_TMPL = """---
+# TCF Canada Expression Orale - Generated Practice
+source_file: {source_file}
+source_url: {source_url}
+task: {task}
+part: {part}
+generated_at: {generated_at}
+---
+
+# Informations
+- Tâche: {task_label}
+- Partie: {part_label}
+- Source URL: {source_url}
+- Source fichier: {source_file}
+
+---
+
+# Original Topic
+{content}
+
+---
+
+"""
+_TASK_LABELS = {'tache_2': 'Tâche 2', 'tache_3': 'Tâche 3'}
+
+# Filename sanitization: characters to drop, and whitespace runs to turn into '_'
+_UNSAFE_RE = re.compile(r'[^\w\s\-.]')
+_WS_RE = re.compile(r'\s+')
+# Same filter as _UNSAFE_RE for pure-ASCII text, applied in one C-level str.translate pass
+_UNSAFE_ASCII_TABLE = str.maketrans({chr(c): None for c in range(128) if _UNSAFE_RE.match(chr(c))})
+
+# Instructions appended to the topics when several are packed into one request
+MULTI_TOPIC_INSTRUCTIONS = (
+    "Generate the practice material described above for EACH of the following {n} topics, "
+    "independently. Return a JSON object of the form {{\"results\": [\"<markdown for topic 1>\", ...]}} "
+    "containing exactly {n} Markdown strings, in the same order as the topics."
+)
+# Output token budget per topic (also the cap of a single-topic request)
+MAX_TOKENS_PER_TOPIC = 2000
+MAX_OUTPUT_TOKENS = 16000
+
+# Context window per model, used to keep prompt + max_tokens inside the limit
+MODEL_CONTEXT_TOKENS = {
+    'gpt-4': 8192,
+    'gpt-4-turbo': 128000,
+    'gpt-4o': 128000,
+    'gpt-4o-mini': 128000,
+    'gpt-3.5-turbo': 16385,
+}
+DEFAULT_CONTEXT_TOKENS = 8192
+# Headroom for the chat message framing tokens that are not part of the text
+TOKEN_MARGIN = 100
+
+# Decorrelated-jitter retry backoff bounds (seconds)
+BACKOFF_BASE = 0.1
+BACKOFF_CAP = 30.0
+
+# System prompt used to adapt a cached response to a near-duplicate topic
+ADAPT_PROMPT = (
+    "You are an expert French language examiner and TCF Canada specialist. You will receive a NEW "
+    "TOPIC, the ORIGINAL TOPIC it closely resembles, and the practice material written for the "
+    "original topic. Rewrite the material so that it fits the new topic exactly, keeping the same "
+    "Markdown structure, sections, level (B2+ to C1) and bolded expressions. Return PURE Markdown ONLY."
+)
+
+
 class TCFOraleGenerator:
     """
     Generator for TCF Canada Expression Orale practice materials using OpenAI
     """
     
-    def __init__(self, api_key: Optional[str] = None, output_base_dir: Optional[str] = None, offline_mode: bool = False):
+    def __init__(self, api_key: Optional[str] = None, output_base_dir: Optional[str] = None, offline_mode: bool = False,
+                 max_concurrency: int = 16, requests_per_minute: int = 500,
+                 cache_dir: Optional[str] = None, cache_sampled: bool = False,
+                 semantic_cache: bool = False, semantic_threshold: float = 0.92,
+                 primary_model: str = "gpt-4o-mini", fallback_model: Optional[str] = "gpt-4o",
+                 stream: bool = True, overwrite: bool = False, topics_per_request: int = 1,
+                 tokens_per_minute: int = 200000):
         """
         Initialize the generator
         
@@ -21,19 +205,46 @@ class TCFOraleGenerator:
             output_base_dir: Base directory for output files. If None, defaults to
                              a sibling folder '../french_learning/tcf_canada/eo'
                              relative to the project root.
+            max_concurrency: Maximum number of topics processed (API requests in flight) at once
+            requests_per_minute: Request rate cap shared by all concurrent API calls
+            cache_dir: Directory of the on-disk response cache (default '~/.cache/tcf_orale')
+            cache_sampled: Also cache responses sampled with temperature > 0. By default only
+                           deterministic (temperature 0) requests are served from the cache.
+            semantic_cache: Adapt the cached response of a near-duplicate topic (embedding cosine
+                            similarity >= semantic_threshold) with a cheap model instead of
+                            generating from scratch
+            primary_model: Model used for every generation
+            fallback_model: Model used to regenerate outputs that fail validation (None to disable)
+            stream: Stream responses token by token, appending them to the output file as they arrive
+            overwrite: Regenerate topics that already have an output file (skipped by default)
+            topics_per_request: Pack this many topics into a single JSON-mode request to cut the
+                                request count when RPM-bound (1 disables packing)
+            tokens_per_minute: Token rate cap (prompt + max_tokens of each request) shared by
+                               all concurrent API calls
         """
         # Set up OpenAI client (skipped in offline template mode)
         self.offline_mode = offline_mode
         if self.offline_mode:
             self.client = None
+            self.async_client = None
         else:
-            if api_key:
-                self.client = OpenAI(api_key=api_key)
-            else:
+            if not api_key:
                 api_key = os.getenv('OPENAI_API_KEY')
                 if not api_key:
                     raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable or pass api_key parameter, or pass offline_mode=True to generate templates without calling GPT.")
-                self.client = OpenAI(api_key=api_key)
+            self.client = OpenAI(api_key=api_key)
+            # Single pooled HTTP/2 client shared by all concurrent requests of the run,
+            # so HTTP-level queueing never caps concurrency below the request limit
+            # SDK-level retries are disabled: _call_openai_async owns the retry policy
+            self.async_client = AsyncOpenAI(
+                api_key=api_key,
+                max_retries=0,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                ),
+            )
         
         # Resolve default output directory to sibling '../french_learning/tcf_canada/eo'
         if output_base_dir is None:
@@ -42,11 +253,15 @@ class TCFOraleGenerator:
             output_base_dir = str(sibling_root)
         
         self.output_base_dir = output_base_dir
-        self.task2_dir = os.path.join(output_base_dir, "task2")
-        self.task3_dir = os.path.join(output_base_dir, "task3")
+        # Path objects built once; per-topic paths are derived with the '/' operator
+        self.task2_dir = Path(output_base_dir) / "task2"
+        self.task3_dir = Path(output_base_dir) / "task3"
         
         # State file to resume progress and numbering across runs
-        self.state_file = os.path.join(output_base_dir, ".generation_state.json")
+        self.state_file = Path(output_base_dir) / ".generation_state.json"
+        self.overwrite = overwrite
+        # Existing output files per task prefix: sanitized topic filename -> paths
+        self._existing_files: Dict[str, Dict[str, List[Path]]] = {}
         self.state: Dict[str, int] = {
             "task2_index": 0,        # next topic index to start from (0-based)
             "task3_index": 0,
@@ -54,18 +269,57 @@ class TCFOraleGenerator:
             "task3_sequence": 0
         }
         
+        # Concurrency controls for the async generation path. The event loop is kept
+        # on the instance so the pooled async client stays usable across calls.
+        self.max_concurrency = max(1, max_concurrency)
+        self.topics_per_request = max(1, topics_per_request)
+        self.rate_limiter = AsyncLimiter(requests_per_minute, 60)
+        self.token_limiter = AsyncLimiter(tokens_per_minute, 60)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Cheap model first, stronger model only when the output fails validation
+        self.primary_model = primary_model
+        self.fallback_model = fallback_model
+        self.stream = stream
+        
+        # On-disk response cache so identical requests are never paid for twice
+        self.cache = DiskCache(cache_dir)
+        self.cache_sampled = cache_sampled
+        # Timestamp shared by every header written during one generation run
+        self._generated_at: Optional[str] = None
+        self.semantic_cache = SemanticCache(self.cache.dir, semantic_threshold) if semantic_cache else None
+        
         # Load prompts
         self.task2_prompt = self._load_prompt("ml-generator/eo_task2_prompt.txt")
         self.task3_prompt = self._load_prompt("ml-generator/eo_task3_prompt.txt")
         
+        # Tokenizer for max_tokens budgeting; the static prompts are counted once here
+        self._enc = None
+        if not self.offline_mode:
+            try:
+                self._enc = tiktoken.encoding_for_model(self.primary_model)
+            except KeyError:
+                self._enc = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"⚠️ Could not load tokenizer ({e}); estimating token counts from text length")
+        self._prompt_tokens: Dict[str, int] = {
+            prompt: self._count_tokens(prompt) for prompt in (self.task2_prompt, self.task3_prompt)
+        }
+        
         # Statistics
         self.stats = {
             "task2_generated": 0,
             "task3_generated": 0,
             "total_api_calls": 0,
             "errors": 0,
-            "skipped": 0
+            "skipped": 0,
+            "skipped_existing": 0,
+            "cache_hits": 0,
+            "semantic_hits": 0,
+            "deduplicated": 0
         }
+        # Per-model counters: {"gpt-4o-mini": {"calls": 3, "failed_validation": 1}, ...}
+        self.model_stats: Dict[str, Dict[str, int]] = {}
 
     def _load_state(self) -> None:
         """Load resume state from disk if available."""
@@ -95,32 +349,24 @@ class TCFOraleGenerator:
     def _load_prompt(self, prompt_file: str) -> str:
         """Load prompt from file"""
         try:
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                return f.read()
+            return Path(prompt_file).read_text(encoding='utf-8')
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt file not found: {prompt_file}")
     
     def _create_directories(self) -> None:
         """Create output directories if they don't exist and load state."""
-        os.makedirs(self.task2_dir, exist_ok=True)
-        os.makedirs(self.task3_dir, exist_ok=True)
+        self.task2_dir.mkdir(parents=True, exist_ok=True)
+        self.task3_dir.mkdir(parents=True, exist_ok=True)
         print(f"📁 Directories ready:\n   - Task 2: {self.task2_dir}\n   - Task 3: {self.task3_dir}")
         
         # Load prior state if any
         self._load_state()
         
-        # Initialize sequence from existing files if larger than state
+        # Initialize sequence from existing files if larger than state, and index existing
+        # files by their sanitized topic name so finished topics can be skipped
         try:
-            def max_seq_in(dir_path: str, prefix: str) -> int:
-                seq = 0
-                for name in os.listdir(dir_path):
-                    if name.startswith(prefix + "_"):
-                        parts = name.split("_")
-                        if len(parts) >= 2 and parts[1].isdigit():
-                            seq = max(seq, int(parts[1]))
-                return seq
-            existing_t2 = max_seq_in(self.task2_dir, "task2")
-            existing_t3 = max_seq_in(self.task3_dir, "task3")
+            existing_t2 = self._index_existing_files("task2")
+            existing_t3 = self._index_existing_files("task3")
             if existing_t2 > self.state["task2_sequence"]:
                 self.state["task2_sequence"] = existing_t2
             if existing_t3 > self.state["task3_sequence"]:
@@ -128,6 +374,52 @@ class TCFOraleGenerator:
         except Exception:
             pass
     
+    def _index_existing_files(self, prefix: str) -> int:
+        """
+        Index the task directory's output files by sanitized topic name and return
+        the highest file sequence number found (0 if the directory is missing)
+        """
+        dir_path = self.task2_dir if prefix == "task2" else self.task3_dir
+        seq = 0
+        existing: Dict[str, List[Path]] = {}
+        try:
+            names = os.listdir(dir_path)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if name.startswith(prefix + "_"):
+                parts = name.split("_", 2)
+                if len(parts) >= 2 and parts[1].isdigit():
+                    seq = max(seq, int(parts[1]))
+                    if len(parts) == 3:
+                        existing.setdefault(parts[2], []).append(dir_path / name)
+        self._existing_files[prefix] = existing
+        return seq
+    
+    def _already_generated(self, prefix: str, topic: Dict) -> bool:
+        """
+        Whether an output file for this topic already exists in the task directory.
+        
+        Filenames are numbered per run, so existing files are matched on their sanitized
+        topic name and then confirmed against the original topic stored in the file
+        (distinct topics can share the same truncated filename).
+        """
+        if prefix not in self._existing_files:
+            # Not indexed yet (entry points that skip _create_directories)
+            self._index_existing_files(prefix)
+        candidates = self._existing_files[prefix].get(self._sanitize_filename(topic['content']))
+        if not candidates:
+            return False
+        marker = f"# Original Topic\n{topic.get('content', 'No content available')}\n"
+        for path in candidates:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    if marker in f.read():
+                        return True
+            except OSError:
+                continue
+        return False
+    
     def _sanitize_filename(self, content: str, max_length: int = 100) -> str:
         """
         Create a safe filename from topic content
@@ -136,9 +428,11 @@ class TCFOraleGenerator:
         filename = content[:max_length]
         
         # Remove or replace unsafe characters
-        filename = re.sub(r'[^\w\s\-.]', '', filename)
-        filename = re.sub(r'\s+', '_', filename)
-        filename = filename.strip('_')
+        if filename.isascii():
+            filename = filename.translate(_UNSAFE_ASCII_TABLE)
+        else:
+            filename = _UNSAFE_RE.sub('', filename)
+        filename = _WS_RE.sub('_', filename).strip('_')
         
         # Ensure it's not empty
         if not filename:
@@ -146,107 +440,321 @@ class TCFOraleGenerator:
         
         return filename + ".md"
     
-    def _call_openai(self, prompt: str, topic_content: str, max_retries: int = 3) -> Optional[str]:
+    @staticmethod
+    def _content_digest(content: str) -> bytes:
+        """
+        Digest identifying topics with identical content
+        """
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+    
+    def _count_tokens(self, text: str) -> int:
+        """
+        Number of tokens in `text` (estimated at ~4 characters per token without a tokenizer)
+        """
+        if self._enc is None:
+            return len(text) // 4 + 1
+        return len(self._enc.encode(text))
+    
+    def _chat_request_body(self, prompt: str, topic_content: str, model: Optional[str] = None,
+                           max_output_tokens: int = MAX_TOKENS_PER_TOPIC) -> Tuple[Dict, int]:
+        """
+        Build the chat.completions request body for a topic (shared by the realtime and batch paths)
+        and return it with the number of input tokens it carries.
+        
+        The long task prompt is sent unchanged as the system message and only the short
+        topic as the user message: provider-side prompt caching matches on the request
+        prefix, so static content must come first and must not embed per-topic data.
+        max_tokens is capped so that input + output always fit the model's context window.
+        """
+        model = model or self.primary_model
+        user_content = f"**TOPIC:** {topic_content}"
+        prompt_tokens = self._prompt_tokens.get(prompt)
+        if prompt_tokens is None:
+            prompt_tokens = self._prompt_tokens[prompt] = self._count_tokens(prompt)
+        input_tokens = prompt_tokens + self._count_tokens(user_content)
+        context = MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": user_content}
+            ],
+            "max_tokens": min(max_output_tokens, context - input_tokens - TOKEN_MARGIN),
+            "temperature": 0.7
+        }
+        return body, input_tokens
+    
+    def _cache_key(self, request_body: Dict) -> Optional[str]:
+        """
+        Cache key for a request body, or None if the request should not be cached
+        (sampled requests are only cached when cache_sampled is enabled)
+        """
+        if request_body.get("temperature", 0) > 0 and not self.cache_sampled:
+            return None
+        return DiskCache.key_for(request_body)
+    
+    async def _call_openai_async(self, prompt: str, topic_content: str, max_retries: int = 3,
+                                 model: Optional[str] = None,
+                                 stream_to: Optional[Tuple[Path, str]] = None,
+                                 request_overrides: Optional[Dict] = None,
+                                 max_output_tokens: int = MAX_TOKENS_PER_TOPIC) -> Optional[str]:
         """
-        Make API call to OpenAI with retry logic
+        Make an async API call to OpenAI with retry logic, throttled by the shared rate limiter
+        
+        If `stream_to` is a (path, header) pair, the response is streamed and written to
+        `path` (after `header`) as tokens arrive. On return the file exists only if it holds
+        the returned content in full; otherwise it is removed.
         """
-        full_prompt = f"{prompt}\n\n---\n\n**TOPIC:** {topic_content}"
+        request_body, input_tokens = self._chat_request_body(prompt, topic_content, model, max_output_tokens)
+        if request_body["max_tokens"] <= 0:
+            print(f"   ❌ Input of {input_tokens} tokens does not fit the context window of {request_body['model']}")
+            self.stats["errors"] += 1
+            self._discard_stream_file(stream_to)
+            return None
+        if request_overrides:
+            request_body.update(request_overrides)
+        # Tokens counted against the TPM limit: the prompt plus the reserved completion
+        request_tokens = min(input_tokens + request_body["max_tokens"], self.token_limiter.max_rate)
+        cache_key = self._cache_key(request_body)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                self._discard_stream_file(stream_to)
+                return cached
         
+        prev_wait = 1.0
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4",  # or "gpt-3.5-turbo" for faster/cheaper option
-                    messages=[
-                        {"role": "system", "content": "You are a French language expert and TCF Canada examiner."},
-                        {"role": "user", "content": full_prompt}
-                    ],
-                    max_tokens=2000,
-                    temperature=0.7
-                )
+                await self.token_limiter.acquire(request_tokens)
+                async with self.rate_limiter:
+                    if stream_to:
+                        content = await self._stream_completion(request_body, *stream_to)
+                    else:
+                        response = await self.async_client.chat.completions.create(**request_body)
+                        content = response.choices[0].message.content
                 
                 self.stats["total_api_calls"] += 1
-                return response.choices[0].message.content.strip()
-                
-            except Exception as e:
-                error_str = str(e).lower()
+                self._model_stat(request_body["model"], "calls")
+                content = content.strip()
+                if cache_key:
+                    self.cache.set(cache_key, content)
+                return content
                 
-                # Handle rate limit errors
-                if "rate limit" in error_str or "quota" in error_str:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    print(f"   ⏳ Rate limit hit, waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                    continue
-                
-                # Handle API errors
-                elif "api" in error_str or "request" in error_str:
+            except (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError,
+                    openai.InternalServerError) as e:
+                # Transient errors: prefer the server's Retry-After, else decorrelated jitter
+                if attempt == max_retries - 1:
                     print(f"   ❌ API Error (attempt {attempt + 1}): {e}")
-                    if attempt == max_retries - 1:
-                        self.stats["errors"] += 1
-                        return None
-                    time.sleep(1)
-                    continue
+                    self.stats["errors"] += 1
+                    self._discard_stream_file(stream_to)
+                    return None
+                wait_time = self._retry_after(e) or self._backoff(prev_wait)
+                prev_wait = wait_time
+                kind = "Rate limit hit" if isinstance(e, openai.RateLimitError) else "Transient API error"
+                print(f"   ⏳ {kind}, waiting {wait_time:.1f}s before retry...")
+                await asyncio.sleep(wait_time)
                 
-                # Handle other errors
-                else:
-                    print(f"   ❌ Unexpected error (attempt {attempt + 1}): {e}")
-                    if attempt == max_retries - 1:
-                        self.stats["errors"] += 1
-                        return None
-                    time.sleep(1)
-                    continue
+            except openai.APIStatusError as e:
+                # Other 4xx errors (bad request, auth, ...) will not succeed on retry
+                print(f"   ❌ API Error: {e}")
+                self.stats["errors"] += 1
+                self._discard_stream_file(stream_to)
+                return None
+                
+            except Exception as e:
+                print(f"   ❌ Unexpected error (attempt {attempt + 1}): {e}")
+                if attempt == max_retries - 1:
+                    self.stats["errors"] += 1
+                    self._discard_stream_file(stream_to)
+                    return None
+                prev_wait = self._backoff(prev_wait)
+                await asyncio.sleep(prev_wait)
         
+        self._discard_stream_file(stream_to)
         return None
     
-    def _save_markdown_file(self, content: str, filepath: str, topic_info: Dict) -> bool:
+    async def _call_openai_multi(self, prompt: str, topics_batch: List[str], task_key: str) -> List[Optional[str]]:
         """
-        Save generated content to markdown file with metadata
+        Generate content for several topics with a single JSON-mode request.
+        
+        Returns one entry per topic; entries are None when the response could not be
+        parsed or the item fails validation, so callers can regenerate them individually.
         """
+        numbered = "\n\n".join(f"<<TOPIC {i}>>\n{topic}" for i, topic in enumerate(topics_batch, 1))
+        multi_input = MULTI_TOPIC_INSTRUCTIONS.format(n=len(topics_batch)) + "\n\n" + numbered
+        response = await self._call_openai_async(
+            prompt, multi_input, request_overrides={"response_format": {"type": "json_object"}},
+            max_output_tokens=min(MAX_OUTPUT_TOKENS, MAX_TOKENS_PER_TOPIC * len(topics_batch)))
+        if not response:
+            return [None] * len(topics_batch)
+        
         try:
-            task_key = topic_info.get('task', 'unknown')
-            if task_key == 'tache_2':
-                task_label = 'Tâche 2'
-            elif task_key == 'tache_3':
-                task_label = 'Tâche 3'
+            results = orjson.loads(response)["results"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            results = None
+        if not isinstance(results, list) or len(results) != len(topics_batch):
+            print("   ⚠️ Multi-topic response unusable, falling back to one request per topic")
+            return [None] * len(topics_batch)
+        
+        checked: List[Optional[str]] = []
+        for content in results:
+            if isinstance(content, str) and self._validate_output(content.strip(), task_key):
+                checked.append(content.strip())
             else:
-                task_label = str(task_key)
-            part_raw = topic_info.get('part', 'unknown')
-            part_label = part_raw
-            try:
-                # Format 'partie_2' -> 'Partie 2'
-                if isinstance(part_raw, str) and '_' in part_raw:
-                    left, right = part_raw.split('_', 1)
-                    part_label = f"{left.capitalize()} {right}"
-            except Exception:
-                pass
-            
-            metadata = f"""---
-# TCF Canada Expression Orale - Generated Practice
-source_file: {topic_info.get('source_file', 'unknown')}
-source_url: {topic_info.get('source_url', 'unknown')}
-task: {task_key}
-part: {topic_info.get('part', 'unknown')}
-generated_at: {time.strftime('%Y-%m-%d %H:%M:%S')}
----
-
-# Informations
-- Tâche: {task_label}
-- Partie: {part_label}
-- Source URL: {topic_info.get('source_url', 'unknown')}
-- Source fichier: {topic_info.get('source_file', 'unknown')}
-
----
-
-# Original Topic
-{topic_info.get('content', 'No content available')}
-
----
-
-"""
-            
-            full_content = metadata + content
+                self._model_stat(self.primary_model, "failed_validation")
+                checked.append(None)
+        return checked
+    
+    async def _stream_completion(self, request_body: Dict, path: Path, header: str) -> str:
+        """
+        Stream a chat completion into `path` (after `header`) and return the full text
+        
+        The file receives the stripped text, as the non-streaming path saves it: leading
+        whitespace is dropped and trailing whitespace is held back until more text follows.
+        """
+        deltas: List[str] = []
+        held = ""
+        started = False
+        stream = await self.async_client.chat.completions.create(**request_body, stream=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(header)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    deltas.append(delta)
+                    text = held + delta if started else delta.lstrip()
+                    written = text.rstrip()
+                    held = text[len(written):]
+                    if written:
+                        f.write(written)
+                        started = True
+        return "".join(deltas)
+    
+    @staticmethod
+    def _discard_stream_file(stream_to: Optional[Tuple[Path, str]]) -> None:
+        """Remove a stream file that does not hold the content being returned"""
+        if stream_to:
+            stream_to[0].unlink(missing_ok=True)
+    
+    @staticmethod
+    def _backoff(prev_wait: float) -> float:
+        """Decorrelated jitter: spreads concurrent retries out instead of waking them together"""
+        return random.uniform(BACKOFF_BASE, min(BACKOFF_CAP, prev_wait * 3))
+    
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds to wait according to the Retry-After header of an API error, if present"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        value = response.headers.get("retry-after")
+        try:
+            return min(BACKOFF_CAP, float(value)) if value else None
+        except ValueError:
+            return None
+    
+    def _model_stat(self, model: str, key: str) -> None:
+        """Increment a per-model counter"""
+        counters = self.model_stats.setdefault(model, {"calls": 0, "failed_validation": 0})
+        counters[key] += 1
+    
+    def _validate_output(self, content: str, task_key: str) -> bool:
+        """
+        Lightweight quality gate: output must be long enough and contain the expected section headers
+        """
+        if not content or len(content) < MIN_OUTPUT_CHARS:
+            return False
+        return all(pattern.search(content) for pattern in EXPECTED_SECTIONS.get(task_key, []))
+    
+    async def _generate_validated(self, task_key: str, prompt: str, topic_content: str,
+                                  stream_to: Optional[Tuple[Path, str]] = None) -> Optional[str]:
+        """
+        Generate with the primary model and regenerate with the fallback model only if
+        the output fails validation
+        """
+        content = await self._call_openai_async(prompt, topic_content, model=self.primary_model, stream_to=stream_to)
+        if content and self._validate_output(content, task_key):
+            return content
+        if content:
+            self._model_stat(self.primary_model, "failed_validation")
+        
+        if self.fallback_model and self.fallback_model != self.primary_model:
+            print(f"   🔁 Output failed validation, regenerating with {self.fallback_model}")
+            fallback_content = await self._call_openai_async(prompt, topic_content, model=self.fallback_model,
+                                                             stream_to=stream_to)
+            if fallback_content:
+                if not self._validate_output(fallback_content, task_key):
+                    self._model_stat(self.fallback_model, "failed_validation")
+                return fallback_content
+        return content
+    
+    async def _embed_async(self, text: str) -> Optional[List[float]]:
+        """
+        Embed a topic with text-embedding-3-small (None on failure)
+        """
+        try:
+            async with self.rate_limiter:
+                response = await self.async_client.embeddings.create(model="text-embedding-3-small", input=text)
+            self.stats["total_api_calls"] += 1
+            return response.data[0].embedding
+        except Exception as e:
+            print(f"   ⚠️ Embedding failed, skipping semantic cache: {e}")
+            return None
+    
+    async def _generate_with_semantic_cache(self, task_key: str, prompt: str, topic_content: str,
+                                            stream_to: Optional[Tuple[Path, str]] = None) -> Optional[str]:
+        """
+        Generate content for a topic, adapting the cached response of a near-duplicate topic
+        with gpt-4o-mini when the semantic cache has one, and indexing new responses
+        """
+        if self.semantic_cache is None:
+            return await self._generate_validated(task_key, prompt, topic_content, stream_to)
+        
+        embedding = await self._embed_async(topic_content)
+        if embedding is not None:
+            match = self.semantic_cache.lookup(task_key, embedding)
+            if match is not None:
+                adapt_input = (f"{topic_content}\n\n**ORIGINAL TOPIC:** {match['topic']}\n\n"
+                               f"**ORIGINAL MATERIAL:**\n\n{match['response']}")
+                adapted = await self._call_openai_async(ADAPT_PROMPT, adapt_input, model="gpt-4o-mini",
+                                                        stream_to=stream_to)
+                if adapted:
+                    self.stats["semantic_hits"] += 1
+                    return adapted
+        
+        generated_content = await self._generate_validated(task_key, prompt, topic_content, stream_to)
+        if generated_content and embedding is not None:
+            self.semantic_cache.add(task_key, topic_content, embedding, generated_content)
+        return generated_content
+    
+    def _build_metadata(self, topic_info: Dict) -> str:
+        """
+        Build the metadata header written before the generated content
+        """
+        fields = defaultdict(lambda: 'unknown', topic_info)
+        task_key = fields['task']
+        part_label = part_raw = fields['part']
+        # Format 'partie_2' -> 'Partie 2'
+        if isinstance(part_raw, str) and '_' in part_raw:
+            left, right = part_raw.split('_', 1)
+            part_label = f"{left.capitalize()} {right}"
+        fields['task_label'] = _TASK_LABELS.get(task_key, str(task_key))
+        fields['part_label'] = part_label
+        fields['content'] = topic_info.get('content', 'No content available')
+        fields['generated_at'] = self._generated_at or time.strftime('%Y-%m-%d %H:%M:%S')
+        return _META_TMPL.format_map(fields)
+    
+    def _save_markdown_file(self, content: str, filepath: Path, topic_info: Dict) -> bool:
+        """
+        Save generated content to markdown file with metadata
+        """
+        try:
+            full_content = self._build_metadata(topic_info) + content
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(full_content)
+            Path(filepath).write_text(full_content, encoding='utf-8')
             
             return True
             
@@ -254,6 +762,23 @@ generated_at: {time.strftime('%Y-%m-%d %H:%M:%S')}
             print(f"   ❌ Error saving file {filepath}: {e}")
             return False
 
+    async def _save_markdown_async(self, content: str, filepath: Path, topic_info: Dict) -> bool:
+        """
+        Save generated content from a worker thread so disk I/O never blocks the event loop
+        """
+        return await asyncio.to_thread(self._save_markdown_file, content, filepath, topic_info)
+    
+    async def _finalize_stream_file(self, stream_path: Path, filepath: Path) -> bool:
+        """
+        Move a fully streamed '.part' file to its final name
+        """
+        try:
+            await asyncio.to_thread(stream_path.replace, filepath)
+            return True
+        except Exception as e:
+            print(f"   ❌ Error saving file {filepath}: {e}")
+            return False
+    
     def _build_template_content(self, task_key: str, topic_info: Dict) -> str:
         """
         Build a Markdown template (no solution) for Expression Orale tasks with
@@ -315,14 +840,15 @@ generated_at: {time.strftime('%Y-%m-%d %H:%M:%S')}
     
     def load_organized_topics(self, json_file: str = "organized_topics.json") -> Tuple[List[Dict], List[Dict]]:
         """
-        Load topics from organized_topics.json
+        Load all topics from organized_topics.json in one orjson pass over the raw bytes
+        
+        Prefer streaming via iter_topics() when only a slice of the topics is needed.
         
         Returns:
             (task2_topics, task3_topics)
         """
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = orjson.loads(Path(json_file).read_bytes())
             
             task2_topics = data.get('task2_topics', [])
             task3_topics = data.get('task3_topics', [])
@@ -340,95 +866,214 @@ generated_at: {time.strftime('%Y-%m-%d %H:%M:%S')}
             print(f"❌ Error loading topics: {e}")
             return [], []
     
-    def generate_task2_content(self, topics: List[Dict], limit: Optional[int] = None) -> None:
+    def iter_topics(self, json_file: str, key: str, start: int = 0, count: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream topics stored under `key` (e.g. 'task2_topics') from the JSON file,
+        yielding only the slice [start, start + count) without loading the whole file.
+        """
+        with open(json_file, 'rb') as f:
+            for i, obj in enumerate(ijson.items(f, f"{key}.item")):
+                if i < start:
+                    continue
+                if count is not None and i >= start + count:
+                    break
+                yield obj
+    
+    def _resume_slice(self, task_key: str, topics: Optional[List[Dict]], limit: Optional[int],
+                      json_file: str) -> Tuple[int, List[Dict]]:
+        """
+        Return (start_idx, work_items) for a task, starting at its resume index.
+        
+        If `topics` is None, only the requested slice is streamed from `json_file`.
+        """
+        prefix = task_key.replace('tache_', 'task')
+        start_idx = self.state.get(f"{prefix}_index", 0)
+        count = None if limit is None else max(0, limit)
+        if topics is not None:
+            work_items = topics[start_idx:] if count is None else topics[start_idx:start_idx + count]
+        else:
+            work_items = list(self.iter_topics(json_file, f"{prefix}_topics", start_idx, count))
+        return start_idx, work_items
+    
+    def _run(self, coro):
+        """Run a coroutine to completion on the generator's event loop."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    async def _generate_task_async(self, topics: List[Dict], task_dir: Path, prompt: str, task_key: str,
+                                   start_idx: int = 0) -> None:
         """
-        Generate Task 2 practice content for given topics, resuming from last index.
+        Generate content for `topics` concurrently (bounded by max_concurrency).
+        
+        The resume index only advances over a contiguous run of finished topics, so
+        an interrupted run never skips topics that were still in flight.
         """
-        start_idx = self.state.get("task2_index", 0)
-        if start_idx >= len(topics):
-            print("✅ All Task 2 topics already processed (or start index beyond list).")
+        prefix = task_key.replace('tache_', 'task')
+        label = prefix.replace('task', 'Task ')
+        if not topics:
+            print(f"✅ All {label} topics already processed (or start index beyond list).")
             return
-        end_idx = len(topics) if limit is None else min(len(topics), start_idx + max(0, limit))
-        work_items = topics[start_idx:end_idx]
-        print(f"\n🎯 Generating Task 2 content for topics {start_idx + 1} to {end_idx} (of {len(topics)})...")
-        
-        for offset, topic in enumerate(work_items):
-            i_global = start_idx + offset + 1
-            print(f"\n📝 Processing Task 2 topic {i_global}/{len(topics)}")
-            print(f"   Content: {topic['content'][:80]}...")
-            
-            if self.offline_mode:
-                generated_content = self._build_template_content('tache_2', topic)
-            else:
-                generated_content = self._call_openai(self.task2_prompt, topic['content'])
-            
+        self._generated_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        print(f"\n🎯 Generating {label} content for topics {start_idx + 1} to {start_idx + len(topics)} "
+              f"({self.max_concurrency} concurrent)...")
+        
+        sem = asyncio.Semaphore(self.max_concurrency)
+        finished = set()
+        write_tasks: List[asyncio.Task] = []
+        # Topics repeating an earlier topic's content: first index -> [(index, topic), ...]
+        duplicates: Dict[int, List[Tuple[int, Dict]]] = {}
+        
+        def mark_finished(i_global: int) -> None:
+            # Advance index over the contiguous finished prefix and save state
+            finished.add(i_global)
+            while self.state[f"{prefix}_index"] + 1 in finished:
+                self.state[f"{prefix}_index"] += 1
+            self._save_state()
+        
+        async def write_and_record(i_global: int, generated_content: str, filepath: Path, topic: Dict,
+                                   stream_path: Optional[Path]) -> None:
+            try:
+                if stream_path and stream_path.exists():
+                    # Content was already streamed to disk: just move it into place
+                    saved = await self._finalize_stream_file(stream_path, filepath)
+                else:
+                    saved = await self._save_markdown_async(generated_content, filepath, topic)
+                if saved:
+                    print(f"   ✅ [{label} #{i_global}] Saved: {filepath.name}")
+                    self.stats[f"{prefix}_generated"] += 1
+                else:
+                    self.stats["errors"] += 1
+            finally:
+                mark_finished(i_global)
+        
+        def skip_existing(i_global: int, topic: Dict) -> bool:
+            if self.overwrite or not self._already_generated(prefix, topic):
+                return False
+            print(f"   ⏭  [{label} #{i_global}] Skipping existing: {self._sanitize_filename(topic['content'])}")
+            self.stats["skipped_existing"] += 1
+            mark_finished(i_global)
+            # Duplicates share the content, so they are covered by the same file
+            for dup_i, dup_topic in duplicates.pop(i_global, ()):
+                skip_existing(dup_i, dup_topic)
+            return True
+        
+        def record_result(i_global: int, topic: Dict, generated_content: Optional[str],
+                          stream_path: Optional[Path]) -> None:
             if generated_content:
                 # Increment persistent sequence and build filename
-                self.state["task2_sequence"] = int(self.state.get("task2_sequence", 0)) + 1
-                seq = self.state["task2_sequence"]
+                self.state[f"{prefix}_sequence"] = int(self.state.get(f"{prefix}_sequence", 0)) + 1
+                seq = self.state[f"{prefix}_sequence"]
                 filename = self._sanitize_filename(topic['content'])
-                filepath = os.path.join(self.task2_dir, f"task2_{seq:03d}_{filename}")
+                filepath = task_dir / f"{prefix}_{seq:03d}_{filename}"
                 
-                if self._save_markdown_file(generated_content, filepath, topic):
-                    print(f"   ✅ Saved: {os.path.basename(filepath)}")
-                    self.stats["task2_generated"] += 1
-                else:
-                    self.stats["errors"] += 1
+                # Write off the critical path so the next API request can start immediately
+                write_tasks.append(asyncio.create_task(
+                    write_and_record(i_global, generated_content, filepath, topic, stream_path)))
             else:
-                print(f"   ❌ Failed to generate content")
+                print(f"   ❌ [{label} #{i_global}] Failed to generate content")
                 self.stats["skipped"] += 1
+                mark_finished(i_global)
             
-            # Advance index and save state after each item
-            self.state["task2_index"] = i_global
-            self._save_state()
-            time.sleep(0.5)
-    
-    def generate_task3_content(self, topics: List[Dict], limit: Optional[int] = None) -> None:
-        """
-        Generate Task 3 practice content for given topics, resuming from last index.
-        """
-        start_idx = self.state.get("task3_index", 0)
-        if start_idx >= len(topics):
-            print("✅ All Task 3 topics already processed (or start index beyond list).")
-            return
-        end_idx = len(topics) if limit is None else min(len(topics), start_idx + max(0, limit))
-        work_items = topics[start_idx:end_idx]
-        print(f"\n🎯 Generating Task 3 content for topics {start_idx + 1} to {end_idx} (of {len(topics)})...")
-        
-        for offset, topic in enumerate(work_items):
-            i_global = start_idx + offset + 1
-            print(f"\n📝 Processing Task 3 topic {i_global}/{len(topics)}")
-            print(f"   Content: {topic['content'][:80]}...")
-            
-            if self.offline_mode:
-                generated_content = self._build_template_content('tache_3', topic)
-            else:
-                generated_content = self._call_openai(self.task3_prompt, topic['content'])
+            # Duplicates get their own copy (with their own metadata) of the same content
+            for dup_i, dup_topic in duplicates.pop(i_global, ()):
+                if generated_content:
+                    self.stats["deduplicated"] += 1
+                record_result(dup_i, dup_topic, generated_content, None)
+        
+        async def bounded(i_global: int, topic: Dict) -> None:
+            if skip_existing(i_global, topic):
+                return
             
-            if generated_content:
-                # Increment persistent sequence and build filename
-                self.state["task3_sequence"] = int(self.state.get("task3_sequence", 0)) + 1
-                seq = self.state["task3_sequence"]
-                filename = self._sanitize_filename(topic['content'])
-                filepath = os.path.join(self.task3_dir, f"task3_{seq:03d}_{filename}")
+            async with sem:
+                print(f"\n📝 Processing {label} topic {i_global}")
+                print(f"   Content: {topic['content'][:80]}...")
                 
-                if self._save_markdown_file(generated_content, filepath, topic):
-                    print(f"   ✅ Saved: {os.path.basename(filepath)}")
-                    self.stats["task3_generated"] += 1
+                stream_path = None
+                if self.offline_mode:
+                    generated_content = self._build_template_content(task_key, topic)
                 else:
-                    self.stats["errors"] += 1
-            else:
-                print(f"   ❌ Failed to generate content")
-                self.stats["skipped"] += 1
+                    stream_to = None
+                    if self.stream:
+                        stream_path = task_dir / f".{prefix}_{i_global:05d}.part"
+                        stream_to = (stream_path, self._build_metadata(topic))
+                    generated_content = await self._generate_with_semantic_cache(task_key, prompt, topic['content'],
+                                                                                 stream_to)
             
-            # Advance index and save state after each item
-            self.state["task3_index"] = i_global
-            self._save_state()
-            time.sleep(0.5)
+            record_result(i_global, topic, generated_content, stream_path)
+        
+        async def bounded_group(group: List[Tuple[int, Dict]]) -> None:
+            pending = [(i_global, topic) for i_global, topic in group if not skip_existing(i_global, topic)]
+            if not pending:
+                return
+            
+            async with sem:
+                print(f"\n📝 Processing {label} topics {', '.join(str(i) for i, _ in pending)} in one request")
+                contents = await self._call_openai_multi(prompt, [topic['content'] for _, topic in pending], task_key)
+            
+            retry = []
+            for (i_global, topic), generated_content in zip(pending, contents):
+                if generated_content:
+                    record_result(i_global, topic, generated_content, None)
+                else:
+                    retry.append(bounded(i_global, topic))
+            # Topics the packed response did not cover go through the single-topic path
+            await asyncio.gather(*retry)
+        
+        # Only the first topic with a given content is sent to the API
+        first_index: Dict[bytes, int] = {}
+        unique_topics: List[Tuple[int, Dict]] = []
+        for i_global, topic in enumerate(topics, start=start_idx + 1):
+            digest = self._content_digest(topic['content'])
+            if digest in first_index:
+                duplicates.setdefault(first_index[digest], []).append((i_global, topic))
+            else:
+                first_index[digest] = i_global
+                unique_topics.append((i_global, topic))
+        
+        numbered_topics = iter(unique_topics)
+        if self.topics_per_request > 1 and not self.offline_mode:
+            groups = iter(lambda: list(itertools.islice(numbered_topics, self.topics_per_request)), [])
+            coros = [bounded_group(group) for group in groups]
+        else:
+            coros = [bounded(i_global, topic) for i_global, topic in numbered_topics]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        # Every pending write must land before stats and state are reported
+        results += await asyncio.gather(*write_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"   ❌ Unexpected error while processing {label}: {result}")
+                self.stats["errors"] += 1
+        
+        if self.semantic_cache is not None:
+            self.semantic_cache.save()
+    
+    def generate_task2_content(self, topics: Optional[List[Dict]] = None, limit: Optional[int] = None,
+                               json_file: str = "organized_topics.json") -> None:
+        """
+        Generate Task 2 practice content, resuming from last index.
+        
+        If `topics` is None, topics are streamed from `json_file` starting at the
+        resume index instead of being materialized in memory.
+        """
+        start_idx, work_items = self._resume_slice('tache_2', topics, limit, json_file)
+        self._run(self._generate_task_async(work_items, self.task2_dir, self.task2_prompt, 'tache_2', start_idx))
+    
+    def generate_task3_content(self, topics: Optional[List[Dict]] = None, limit: Optional[int] = None,
+                               json_file: str = "organized_topics.json") -> None:
+        """
+        Generate Task 3 practice content, resuming from last index.
+        
+        If `topics` is None, topics are streamed from `json_file` starting at the
+        resume index instead of being materialized in memory.
+        """
+        start_idx, work_items = self._resume_slice('tache_3', topics, limit, json_file)
+        self._run(self._generate_task_async(work_items, self.task3_dir, self.task3_prompt, 'tache_3', start_idx))
     
-    def generate_all_content(self, task2_limit: Optional[int] = None, task3_limit: Optional[int] = None) -> None:
+    def generate_all_content(self, task2_limit: Optional[int] = None, task3_limit: Optional[int] = None,
+                             json_file: str = "organized_topics.json") -> None:
         """
-        Generate all content for both tasks
+        Generate all content for both tasks, streaming topics from `json_file`
         """
         print("🚀 Starting TCF Orale Content Generation...")
         
@@ -437,24 +1082,195 @@ generated_at: {time.strftime('%Y-%m-%d %H:%M:%S')}
         print(f"🧭 Resume positions -> Task2 index: {self.state.get('task2_index', 0)}, Task3 index: {self.state.get('task3_index', 0)}")
         print(f"🔢 File sequences -> Task2: {self.state.get('task2_sequence', 0)}, Task3: {self.state.get('task3_sequence', 0)}")
         
-        # Load topics
-        task2_topics, task3_topics = self.load_organized_topics()
-        
-        if not task2_topics and not task3_topics:
-            print("❌ No topics loaded. Exiting.")
+        if not os.path.exists(json_file):
+            print(f"❌ File not found: {json_file}. Exiting.")
             return
         
-        # Generate Task 2 content
-        if task2_topics and (task2_limit is None or task2_limit > 0):
-            self.generate_task2_content(task2_topics, task2_limit)
+        # Generate Task 2 content (topics are streamed from the resume index)
+        if task2_limit is None or task2_limit > 0:
+            self.generate_task2_content(limit=task2_limit, json_file=json_file)
         
         # Generate Task 3 content
-        if task3_topics and (task3_limit is None or task3_limit > 0):
-            self.generate_task3_content(task3_topics, task3_limit)
+        if task3_limit is None or task3_limit > 0:
+            self.generate_task3_content(limit=task3_limit, json_file=json_file)
         
         # Print final statistics
         self._print_final_stats()
     
+    def _build_batch_jsonl(self, topics: List[Dict], prompt: str, task_key: str, start_idx: int,
+                           jsonl_file) -> Dict[str, Dict]:
+        """
+        Append one Batch API request per topic to an open JSONL file.
+        
+        The custom_id encodes task and global topic index (e.g. 'task2_007') so results
+        can be mapped back to their topic.
+        
+        Topics repeating an earlier topic's content are not written to the file; their
+        entry carries the custom_id of that topic under "duplicate_of" instead. Topics
+        whose input does not fit the model's context window are reported and skipped.
+        
+        Returns:
+            Mapping of custom_id -> {"topic": topic info, "cache_key": response cache key or None}
+        """
+        prefix = task_key.replace('tache_', 'task')
+        requests_by_id: Dict[str, Dict] = {}
+        first_id: Dict[bytes, str] = {}
+        for offset, topic in enumerate(topics):
+            custom_id = f"{prefix}_{start_idx + offset + 1:03d}"
+            if not self.overwrite and self._already_generated(prefix, topic):
+                print(f"   ⏭  [{custom_id}] Skipping existing: {self._sanitize_filename(topic['content'])}")
+                self.stats["skipped_existing"] += 1
+                continue
+            digest = self._content_digest(topic['content'])
+            if digest in first_id:
+                requests_by_id[custom_id] = {"topic": topic, "cache_key": None, "duplicate_of": first_id[digest]}
+                continue
+            body, input_tokens = self._chat_request_body(prompt, topic['content'])
+            if body["max_tokens"] <= 0:
+                print(f"   ❌ [{custom_id}] Input of {input_tokens} tokens does not fit the context window of {body['model']}")
+                self.stats["errors"] += 1
+                continue
+            first_id[digest] = custom_id
+            request = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }
+            jsonl_file.write(json.dumps(request, ensure_ascii=False) + "\n")
+            requests_by_id[custom_id] = {"topic": topic, "cache_key": self._cache_key(request["body"])}
+        return requests_by_id
+    
+    def submit_and_wait(self, jsonl_path: str, poll_interval: float = 60.0) -> Optional[str]:
+        """
+        Upload a Batch API input file, create the batch and poll until it reaches a terminal state.
+        
+        Returns:
+            Content of the batch output file (JSONL), or None if the batch did not complete
+        """
+        with open(jsonl_path, 'rb') as f:
+            batch_input = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"📦 Batch submitted: {batch.id}")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            progress = f" ({counts.completed}/{counts.total})" if counts else ""
+            print(f"   ⏳ Batch status: {batch.status}{progress}")
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"❌ Batch ended with status '{batch.status}'")
+            return None
+        return self.client.files.content(batch.output_file_id).text
+    
+    def generate_all_content_batch(self, task2_limit: Optional[int] = None, task3_limit: Optional[int] = None,
+                                   json_file: str = "organized_topics.json", poll_interval: float = 60.0) -> None:
+        """
+        Generate all content for both tasks through the OpenAI Batch API
+        (half the price of realtime calls, results within 24 hours)
+        """
+        print("🚀 Starting TCF Orale Content Generation (Batch API)...")
+        self._generated_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        
+        self._create_directories()
+        if not os.path.exists(json_file):
+            print(f"❌ File not found: {json_file}. Exiting.")
+            return
+        
+        # Serialize every pending topic of both tasks into a single batch input file
+        jsonl_path = os.path.join(self.output_base_dir, ".batch_input.jsonl")
+        requests_by_id: Dict[str, Dict] = {}
+        next_index: Dict[str, int] = {}
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for task_key, prompt, limit in (('tache_2', self.task2_prompt, task2_limit),
+                                            ('tache_3', self.task3_prompt, task3_limit)):
+                start_idx, work_items = self._resume_slice(task_key, None, limit, json_file)
+                next_index[task_key.replace('tache_', 'task')] = start_idx + len(work_items)
+                requests_by_id.update(self._build_batch_jsonl(work_items, prompt, task_key, start_idx, f))
+        
+        if not requests_by_id:
+            print("✅ All topics already processed (or start index beyond list).")
+            return
+        
+        # Serve cached responses directly; only cache misses are submitted
+        results: Dict[str, Optional[str]] = {}
+        unique_ids = [custom_id for custom_id, request in requests_by_id.items() if "duplicate_of" not in request]
+        for custom_id in unique_ids:
+            request = requests_by_id[custom_id]
+            if request["cache_key"]:
+                cached = self.cache.get(request["cache_key"])
+                if cached is not None:
+                    results[custom_id] = cached
+                    self.stats["cache_hits"] += 1
+        if len(results) < len(unique_ids):
+            if results:
+                with open(jsonl_path, 'r', encoding='utf-8') as f:
+                    pending_lines = [line for line in f if json.loads(line)["custom_id"] not in results]
+                with open(jsonl_path, 'w', encoding='utf-8') as f:
+                    f.writelines(pending_lines)
+            pending = len(unique_ids) - len(results)
+            print(f"📝 Prepared {pending} batch requests in {jsonl_path} ({len(results)} served from cache)")
+            
+            output = self.submit_and_wait(jsonl_path, poll_interval)
+            if output is None:
+                self.stats["errors"] += 1
+                self._print_final_stats()
+                return
+            self.stats["total_api_calls"] += pending
+            
+            # Map results back to topics via custom_id
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get('response') or {}
+                if response.get('status_code') == 200:
+                    content = response['body']['choices'][0]['message']['content'].strip()
+                    results[result['custom_id']] = content
+                    cache_key = requests_by_id[result['custom_id']]["cache_key"]
+                    if cache_key:
+                        self.cache.set(cache_key, content)
+                else:
+                    results[result['custom_id']] = None
+        
+        # Requests were registered in topic order (task 2, then task 3), which keeps file
+        # numbering in topic order; sorting the zero-padded custom_ids would not past 999
+        for custom_id in requests_by_id:
+            request = requests_by_id[custom_id]
+            topic = request["topic"]
+            prefix = custom_id.rsplit('_', 1)[0]
+            task_dir = self.task2_dir if prefix == 'task2' else self.task3_dir
+            generated_content = results.get(request.get("duplicate_of", custom_id))
+            if generated_content and "duplicate_of" in request:
+                self.stats["deduplicated"] += 1
+            if not generated_content:
+                print(f"   ❌ [{custom_id}] Failed to generate content")
+                self.stats["skipped"] += 1
+                continue
+            
+            self.state[f"{prefix}_sequence"] = int(self.state.get(f"{prefix}_sequence", 0)) + 1
+            seq = self.state[f"{prefix}_sequence"]
+            filename = self._sanitize_filename(topic['content'])
+            filepath = task_dir / f"{prefix}_{seq:03d}_{filename}"
+            if self._save_markdown_file(generated_content, filepath, topic):
+                print(f"   ✅ [{custom_id}] Saved: {filepath.name}")
+                self.stats[f"{prefix}_generated"] += 1
+            else:
+                self.stats["errors"] += 1
+        
+        # The whole batch is done: advance both resume positions past the submitted topics
+        for prefix, index in next_index.items():
+            self.state[f"{prefix}_index"] = index
+        self._save_state()
+        
+        self._print_final_stats()
+    
     def _print_final_stats(self) -> None:
         """Print generation statistics"""
         print(f"\n{'='*60}")
@@ -466,6 +1282,12 @@ generated_at: {time.strftime('%Y-%m-%d %H:%M:%S')}
         print(f"   - Total API calls made: {self.stats['total_api_calls']}")
         print(f"   - Errors encountered: {self.stats['errors']}")
         print(f"   - Topics skipped: {self.stats['skipped']}")
+        print(f"   - Topics already generated (skipped): {self.stats['skipped_existing']}")
+        print(f"   - Responses served from cache: {self.stats['cache_hits']}")
+        print(f"   - Responses adapted from similar topics: {self.stats['semantic_hits']}")
+        print(f"   - Duplicate topics copied without an API call: {self.stats['deduplicated']}")
+        for model, counters in self.model_stats.items():
+            print(f"   - {model}: {counters['calls']} calls, {counters['failed_validation']} failed validation")
         
         total_generated = self.stats['task2_generated'] + self.stats['task3_generated']
         print(f"   - Total files created: {total_generated}")
@@ -501,6 +1323,22 @@ def main():
     # CLI args
     parser = argparse.ArgumentParser(description="Generate TCF Expression Orale content or templates")
     parser.add_argument("--offline", action="store_true", help="Generate templates without calling GPT")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Call the API directly instead of submitting an (asynchronous, 50%% cheaper) batch")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum number of API requests in flight")
+    parser.add_argument("--rpm", type=int, default=500, help="Maximum API requests per minute")
+    parser.add_argument("--tpm", type=int, default=200000,
+                        help="Maximum API tokens per minute (prompt + reserved completion tokens)")
+    parser.add_argument("--cache-sampled", action="store_true",
+                        help="Reuse cached responses even for sampled (temperature > 0) requests")
+    parser.add_argument("--force", action="store_true", help="Regenerate topics that already have an output file")
+    parser.add_argument("--model", default="gpt-4o-mini", help="Primary generation model")
+    parser.add_argument("--fallback-model", default="gpt-4o",
+                        help="Model used to regenerate outputs that fail validation")
+    parser.add_argument("--topics-per-request", type=int, default=1,
+                        help="Pack several topics into one JSON-mode request (realtime mode)")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="Adapt responses of near-duplicate topics with a cheaper model (realtime mode)")
     args, unknown = parser.parse_known_args()
 
     env_has_key = bool(os.getenv('OPENAI_API_KEY'))
@@ -511,11 +1349,19 @@ def main():
 
     # Initialize generator
     try:
-        generator = TCFOraleGenerator(offline_mode=offline_mode)
+        generator = TCFOraleGenerator(offline_mode=offline_mode, max_concurrency=args.concurrency,
+                                      requests_per_minute=args.rpm, cache_sampled=args.cache_sampled,
+                                      semantic_cache=args.semantic_cache, primary_model=args.model,
+                                      fallback_model=args.fallback_model, overwrite=args.force,
+                                      topics_per_request=args.topics_per_request, tokens_per_minute=args.tpm)
     except ValueError as e:
         print(f"⚠️ {e}")
         print("ℹ️ Falling back to offline template mode.")
-        generator = TCFOraleGenerator(offline_mode=True)
+        generator = TCFOraleGenerator(offline_mode=True, max_concurrency=args.concurrency,
+                                      requests_per_minute=args.rpm, cache_sampled=args.cache_sampled,
+                                      semantic_cache=args.semantic_cache, primary_model=args.model,
+                                      fallback_model=args.fallback_model, overwrite=args.force,
+                                      topics_per_request=args.topics_per_request, tokens_per_minute=args.tpm)
     
     # Preview topics
     generator.preview_topics(5)
@@ -537,8 +1383,11 @@ def main():
         confirm = input("\nProceed with generation? (y/N): ").strip().lower()
         
         if confirm == 'y':
-            # Generate content
-            generator.generate_all_content(task2_limit, task3_limit)
+            # Generate content (Batch API unless realtime output is requested)
+            if offline_mode or args.realtime:
+                generator.generate_all_content(task2_limit, task3_limit)
+            else:
+                generator.generate_all_content_batch(task2_limit, task3_limit)
         else:
             print("❌ Generation cancelled.")
             
@@ -1,14 +1,188 @@
 import json
+import logging
+import mmap
 import os
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-@dataclass
+try:
+    import ahocorasick  # optional: single-pass keyword screening
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # optional: prefix and keyword screening in one compiled scan
+except ImportError:
+    hyperscan = None
+
+try:
+    import orjson  # optional: faster JSON parsing and export
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# French month names to numbers mapping
+FRENCH_MONTHS = {
+    'janvier': 1, 'fevrier': 2, 'mars': 3, 'avril': 4,
+    'mai': 5, 'juin': 6, 'juillet': 7, 'aout': 8,
+    'septembre': 9, 'octobre': 10, 'novembre': 11, 'decembre': 12
+}
+MONTH_NAMES = {number: name for name, number in FRENCH_MONTHS.items()}
+
+# Leading 'month-year' of any file name (used to date topics by their source file)
+_DATE_RE = re.compile(r'^(' + '|'.join(FRENCH_MONTHS) + r')-(\d+)(?:-|\.json|$)', re.IGNORECASE)
+
+# Non-topic prefixes scraped from Expression Écrite pages
+BLACKLIST_PREFIXES = (
+    'AccueilSe connecter',
+    'Nous utilisons des cookies',
+    'Nos Contacts',
+    '🎯 Nouveau Service Exceptionnel',
+    'Sujets d\'actualité corrigés pour',
+    'les méthodologiesCompréhension',
+    'Les méthodologiesCompréhension',
+    'Partager avec votre réseau',
+    'Combinaison',
+    'Tâche 1',
+    'Tâche 2',
+    'Tâche 3',
+    'Document 1',
+    'Document 2',
+    'mots minimum',
+    'mots maximum',
+    '/* <![CDATA[ */ var ldVars =',
+    '/* <![CDATA['
+)
+
+# Keywords of content that looks like navigation menus or metadata
+NAVIGATION_KEYWORDS = (
+    'AccueilSe connecter', 'Compréhension écrite', 'Expression Orale',
+    'Nos Formations', 'Cabinet d\'immigration', 'Contactez-nous',
+    'Politique de retour', 'Mentions Légales', 'les pagesActualité',
+    'Les pages', 'Nous acceptons', 'Paiment', 'Cliquez ici'
+)
+
+# Both lists compiled once into a single alternation each
+_BLACKLIST_PREFIX_RE = re.compile('|'.join(map(re.escape, BLACKLIST_PREFIXES)))
+_NAVIGATION_RE = re.compile('|'.join(map(re.escape, NAVIGATION_KEYWORDS)))
+
+# Aho-Corasick automaton over the navigation keywords (when pyahocorasick is installed)
+_NAVIGATION_AC = None
+if ahocorasick is not None:
+    _NAVIGATION_AC = ahocorasick.Automaton()
+    for _keyword in NAVIGATION_KEYWORDS:
+        _NAVIGATION_AC.add_word(_keyword, _keyword)
+    _NAVIGATION_AC.make_automaton()
+
+
+# Exported topic fields, in output order (Task 3 topics also export their documents)
+EXPORT_FIELDS = ('content', 'source_url', 'source_file', 'task', 'word_count', 'type', 'combination')
+EXPORT_FIELDS_WITH_DOCUMENTS = ('content', 'source_url', 'source_file', 'task', 'word_count', 'type',
+                                'documents', 'combination')
+_get_export_fields = attrgetter(*EXPORT_FIELDS)
+_get_export_fields_with_documents = attrgetter(*EXPORT_FIELDS_WITH_DOCUMENTS)
+_get_date_key = attrgetter('date_key')
+
+# Section words that appear in topics at most once (repeated means a scraped menu)
+_SECTION_WORD_RE = re.compile('Compréhension|Expression')
+
+# Hyperscan database of the anchored prefixes and the keywords together (when installed);
+# scanning needs one scratch space per thread since files are parsed concurrently
+_SCREEN_DB = None
+_screen_local = threading.local()
+if hyperscan is not None:
+    _screen_patterns = ([b'^' + re.escape(prefix).encode('utf-8') for prefix in BLACKLIST_PREFIXES]
+                        + [re.escape(keyword).encode('utf-8') for keyword in NAVIGATION_KEYWORDS])
+    _SCREEN_DB = hyperscan.Database()
+    _SCREEN_DB.compile(expressions=_screen_patterns,
+                       flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_screen_patterns))
+
+
+def _topic_from_dict(topic_data: Dict, default_word_count: str, has_documents: bool) -> Tuple:
+    """
+    (content, combination, word_count, documents) of a topic stored as an object
+    """
+    content = topic_data.get('content', '')
+    combination = topic_data.get('combination', 'Unknown')
+    if has_documents:
+        return content, combination, default_word_count, topic_data.get('documents') or None
+    return content, combination, topic_data.get('word_count', default_word_count), None
+
+
+def _topic_from_str(topic_data: str, default_word_count: str, has_documents: bool) -> Tuple:
+    """
+    (content, combination, word_count, documents) of a topic stored as plain text
+    """
+    return topic_data, 'Unknown', default_word_count, None
+
+
+# Topic entry type -> field extractor (entries of any other type are skipped)
+_TOPIC_HANDLERS = {dict: _topic_from_dict, str: _topic_from_str}
+
+
+def _dumps(obj) -> bytes:
+    """
+    Serialize to UTF-8 JSON indented by 2 spaces (orjson when available)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _has_navigation_keyword(content: str) -> bool:
+    """
+    Whether content contains any navigation keyword (one pass over the text)
+    """
+    if _NAVIGATION_AC is not None:
+        return next(_NAVIGATION_AC.iter(content), None) is not None
+    return _NAVIGATION_RE.search(content) is not None
+
+
+def _stop_scan(*_) -> bool:
+    return True
+
+
+def _is_non_topic(content: str) -> bool:
+    """
+    Whether content starts with a blacklisted prefix or contains a navigation keyword
+    """
+    if _SCREEN_DB is not None:
+        scratch = getattr(_screen_local, 'scratch', None)
+        if scratch is None:
+            scratch = _screen_local.scratch = hyperscan.Scratch(_SCREEN_DB)
+        try:
+            _SCREEN_DB.scan(content.encode('utf-8'), match_event_handler=_stop_scan, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True  # the first match stops the scan
+        return False
+    return _BLACKLIST_PREFIX_RE.match(content) is not None or _has_navigation_keyword(content)
+
+
+def _repeats_section_word(content: str) -> bool:
+    """
+    Whether 'Compréhension' or 'Expression' occurs more than once (single pass, stops early)
+    """
+    seen = set()
+    for m in _SECTION_WORD_RE.finditer(content):
+        word = m.group()
+        if word in seen:
+            return True
+        seen.add(word)
+    return False
+
+@dataclass(slots=True)
 class EETopicItem:
     """
     Data class to represent a single Expression Écrite topic with metadata
+    (slotted: thousands are kept in memory, without a per-instance __dict__)
     """
     content: str
     source_url: str
@@ -18,23 +192,48 @@ class EETopicItem:
     type: str  # e.g., 'message_personnel', 'article_blog', 'texte_argumentatif'
     documents: Optional[List[str]] = None  # For Task 3 only
     combination: Optional[str] = None  # Source combination number
+    date_key: Tuple[int, int] = field(default=(1900, 1), repr=False, compare=False)  # (year, month) of source_file
 
 class TCFExpressionEcriteParser:
     """
     Parser to read and organize TCF Canada Expression Écrite topics from JSON files
     """
     
-    def __init__(self, output_dir: str = "output"):
+    # task key -> (default word count, topic type, has documents); Task 3 always uses
+    # its default word count and is the only task carrying documents
+    TASK_SPECS = {
+        'tache_1': ('60-120', 'message_personnel', False),
+        'tache_2': ('120-150', 'article_blog', False),
+        'tache_3': ('120-180', 'texte_argumentatif', True),
+    }
+    
+    def __init__(self, output_dir: str = "output", quiet: bool = False):
         """
         Initialize the parser with the output directory containing JSON files
+        
+        Progress is reported through the module logger at INFO level (errors always
+        are); quiet=True suppresses the progress messages.
         """
         self.output_dir = output_dir
+        self.quiet = quiet
         self.task1_topics: List[EETopicItem] = []
         self.task2_topics: List[EETopicItem] = []
         self.task3_topics: List[EETopicItem] = []
+        # Same list objects as above (they are only ever sorted in place)
+        self._task_map: Dict[str, List[EETopicItem]] = {
+            'tache_1': self.task1_topics,
+            'tache_2': self.task2_topics,
+            'tache_3': self.task3_topics,
+        }
         self.files_processed: List[str] = []
         self.total_topics_found = 0
         
+        # (year, month) of each source file, parsed once while listing the directory
+        self._file_dates: Dict[str, Tuple[int, int]] = {}
+        
+        # Topics of each source file per task, filled while files are processed
+        self._by_source: Dict[str, Tuple[List[EETopicItem], List[EETopicItem], List[EETopicItem]]] = {}
+        
         # Track content for deduplication (normalized content -> first occurrence)
         self._seen_content: Dict[str, str] = {}  # normalized_content -> source_file
         self.duplicates_removed = 0
@@ -44,112 +243,86 @@ class TCFExpressionEcriteParser:
         Load all Expression Écrite topics from JSON files in the output directory
         Returns: (task1_topics, task2_topics, task3_topics)
         """
-        print(f"🔍 Scanning directory for Expression Écrite topics: {self.output_dir}")
+        self._info(f"🔍 Scanning directory for Expression Écrite topics: {self.output_dir}")
         
-        # Get all Expression Écrite JSON files in the output directory
-        json_files = [f for f in os.listdir(self.output_dir) 
-                     if f.endswith('.json') and 'expression-ecrite' in f]
+        # Get all Expression Écrite JSON files in the output directory and parse
+        # each one's date once
+        with os.scandir(self.output_dir) as entries:
+            json_files = [entry.name for entry in entries
+                          if entry.name.endswith('.json') and 'expression-ecrite' in entry.name]
+        for name in json_files:
+            self._file_dates[name] = self._extract_date_from_filename(name)
         
         if not json_files:
-            print(f"❌ No Expression Écrite JSON files found in {self.output_dir}")
+            logger.warning(f"❌ No Expression Écrite JSON files found in {self.output_dir}")
             return self.task1_topics, self.task2_topics, self.task3_topics
         
         # Sort files by date (newest to oldest)
-        json_files_sorted = self._sort_files_by_date(json_files)
-        
-        print(f"📁 Found {len(json_files_sorted)} Expression Écrite JSON files (sorted by date - newest to oldest)")
-        
-        # Process each JSON file in chronological order
-        for json_file in json_files_sorted:
-            self._process_json_file(json_file)
-        
-        # Sort topics by chronological order (newest first)
-        def sort_key(topic):
-            # Extract date from source_file for sorting
-            year, month = self._extract_date_from_filename(topic.source_file)
-            return (-year, -month)  # Negative for reverse order (newest first)
+        json_files_sorted = self._sort_files_by_date(json_files, verbose=not self.quiet)
+        
+        self._info(f"📁 Found {len(json_files_sorted)} Expression Écrite JSON files (sorted by date - newest to oldest)")
+        
+        # Parse files in parallel, then deduplicate and collect them in chronological
+        # order so the first occurrence of a topic is always kept from the newest file
+        with ThreadPoolExecutor(max_workers=min(len(json_files_sorted), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(self._parse_json_file, json_file) for json_file in json_files_sorted]
+            for json_file, future in zip(json_files_sorted, futures):
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    logger.error(f"   ❌ Error processing {json_file}: {e}")
+                    continue
+                self._process_json_file(json_file, parsed)
         
-        self.task1_topics.sort(key=sort_key)
-        self.task2_topics.sort(key=sort_key)
-        self.task3_topics.sort(key=sort_key)
+        # Sort topics by chronological order (newest first); the date of each topic's
+        # source file was attached when it was created, and reverse sorting stays stable
+        self.task1_topics.sort(key=_get_date_key, reverse=True)
+        self.task2_topics.sort(key=_get_date_key, reverse=True)
+        self.task3_topics.sort(key=_get_date_key, reverse=True)
         
         self._print_summary()
         
         return self.task1_topics, self.task2_topics, self.task3_topics
     
-    def _sort_files_by_date(self, json_files: List[str]) -> List[str]:
+    def _sort_files_by_date(self, json_files: List[str], verbose: bool = False) -> List[str]:
         """
-        Sort JSON files by date from newest to oldest
+        Sort JSON files by date from newest to oldest (listing them if verbose)
         Expected format: month-year-expression-ecrite.json
         """
-        # French month names to numbers mapping
-        french_months = {
-            'janvier': 1, 'fevrier': 2, 'mars': 3, 'avril': 4,
-            'mai': 5, 'juin': 6, 'juillet': 7, 'aout': 8,
-            'septembre': 9, 'octobre': 10, 'novembre': 11, 'decembre': 12
-        }
-        
         def extract_date(filename: str) -> Tuple[int, int]:
             """
             Extract year and month from filename
             Returns: (year, month) tuple for sorting
             """
-            try:
-                # Remove the .json extension and split by hyphens
-                base_name = filename.replace('.json', '')
-                parts = base_name.split('-')
-                
-                if len(parts) >= 2:
-                    month_name = parts[0].lower()
-                    year_str = parts[1]
-                    
-                    if month_name in french_months and year_str.isdigit():
-                        year = int(year_str)
-                        month = french_months[month_name]
-                        return (year, month)
-            except:
-                pass
-            
-            # If parsing fails, return a default date (very old)
-            return (1900, 1)
-        
-        # Sort by date (newest first)
-        sorted_files = sorted(json_files, key=extract_date, reverse=True)
+            if filename in self._file_dates:
+                return self._file_dates[filename]
+            return self._extract_date_from_filename(filename)
+        
+        # Sort by date (newest first) on (date, filename) pairs built once
+        decorated = [(extract_date(filename), filename) for filename in json_files]
+        decorated.sort(reverse=True)
+        sorted_files = [filename for _, filename in decorated]
         
         # Print the sorted order for verification
-        print("📅 Files sorted by date (newest to oldest):")
-        for i, filename in enumerate(sorted_files, 1):
-            year, month = extract_date(filename)
-            month_names = {v: k for k, v in french_months.items()}
-            month_name = month_names.get(month, 'unknown')
-            print(f"   {i:2d}. {filename} ({month_name.capitalize()} {year})")
+        if verbose:
+            lines = ["📅 Files sorted by date (newest to oldest):"]
+            for i, ((year, month), filename) in enumerate(decorated, 1):
+                month_name = MONTH_NAMES.get(month, 'unknown')
+                lines.append(f"   {i:2d}. {filename} ({month_name.capitalize()} {year})")
+            self._info("\n".join(lines))
         
         return sorted_files
     
-    def _extract_date_from_filename(self, filename: str) -> Tuple[int, int]:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _extract_date_from_filename(filename: str) -> Tuple[int, int]:
         """
-        Extract year and month from filename for sorting
+        Extract year and month from filename for sorting (memoized: the same
+        few filenames are looked up once per topic)
         """
-        french_months = {
-            'janvier': 1, 'fevrier': 2, 'mars': 3, 'avril': 4,
-            'mai': 5, 'juin': 6, 'juillet': 7, 'aout': 8,
-            'septembre': 9, 'octobre': 10, 'novembre': 11, 'decembre': 12
-        }
-        
-        try:
-            base_name = filename.replace('.json', '')
-            parts = base_name.split('-')
-            
-            if len(parts) >= 2:
-                month_name = parts[0].lower()
-                year_str = parts[1]
-                
-                if month_name in french_months and year_str.isdigit():
-                    year = int(year_str)
-                    month = french_months[month_name]
-                    return (year, month)
-        except:
-            pass
+        m = _DATE_RE.match(filename)
+        if m:
+            return (int(m.group(2)), FRENCH_MONTHS[m.group(1).lower()])
         
         return (1900, 1)  # Default for unparseable filenames
     
@@ -186,7 +359,7 @@ class TCFExpressionEcriteParser:
         if normalized in self._seen_content:
             # It's a duplicate
             original_file = self._seen_content[normalized]
-            print(f"   🔄 Duplicate content found (original in {original_file})")
+            self._info(f"   🔄 Duplicate content found (original in {original_file})")
             self.duplicates_removed += 1
             return True
         else:
@@ -194,114 +367,78 @@ class TCFExpressionEcriteParser:
             self._seen_content[normalized] = current_file
             return False
     
-    def _process_json_file(self, json_file: str) -> None:
+    def _parse_json_file(self, json_file: str) -> Tuple[List[EETopicItem], List[EETopicItem], List[EETopicItem]]:
         """
-        Process a single Expression Écrite JSON file and extract topics
+        Read a single Expression Écrite JSON file and build its cleaned topics
+        (before deduplication). Does not modify the parser, so files can be
+        parsed concurrently.
+        Returns: (task1_topics, task2_topics, task3_topics)
         """
         file_path = os.path.join(self.output_dir, json_file)
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
+            if orjson is not None:
+                # Parse straight from the mapped file, without an intermediate bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    data = orjson.loads(view)
+            else:
                 data = json.load(f)
-            
-            print(f"📄 Processing: {json_file}")
-            
-            source_url = data.get('source_url', 'Unknown')
-            topics = data.get('topics', {})
-            
-            file_topic_count = 0
-            
-            # Process Task 1 topics
-            tache_1 = topics.get('tache_1', [])
-            for topic_data in tache_1:
-                if isinstance(topic_data, dict):
-                    content = topic_data.get('content', '')
-                    combination = topic_data.get('combination', 'Unknown')
-                    word_count = topic_data.get('word_count', '60-120')
-                elif isinstance(topic_data, str):
-                    content = topic_data
-                    combination = 'Unknown'
-                    word_count = '60-120'
-                else:
-                    continue
-                
-                cleaned_content = self._clean_topic_content(content)
-                if cleaned_content and not self._is_duplicate_content(cleaned_content, json_file):
-                    topic_item = EETopicItem(
-                        content=cleaned_content,
-                        source_url=source_url,
-                        source_file=json_file,
-                        task='tache_1',
-                        word_count=word_count,
-                        type='message_personnel',
-                        combination=combination
-                    )
-                    self.task1_topics.append(topic_item)
-                    file_topic_count += 1
-            
-            # Process Task 2 topics
-            tache_2 = topics.get('tache_2', [])
-            for topic_data in tache_2:
-                if isinstance(topic_data, dict):
-                    content = topic_data.get('content', '')
-                    combination = topic_data.get('combination', 'Unknown')
-                    word_count = topic_data.get('word_count', '120-150')
-                elif isinstance(topic_data, str):
-                    content = topic_data
-                    combination = 'Unknown'
-                    word_count = '120-150'
-                else:
-                    continue
-                
-                cleaned_content = self._clean_topic_content(content)
-                if cleaned_content and not self._is_duplicate_content(cleaned_content, json_file):
-                    topic_item = EETopicItem(
-                        content=cleaned_content,
-                        source_url=source_url,
-                        source_file=json_file,
-                        task='tache_2',
-                        word_count=word_count,
-                        type='article_blog',
-                        combination=combination
-                    )
-                    self.task2_topics.append(topic_item)
-                    file_topic_count += 1
-            
-            # Process Task 3 topics
-            tache_3 = topics.get('tache_3', [])
-            for topic_data in tache_3:
-                if isinstance(topic_data, dict):
-                    content = topic_data.get('content', '')
-                    combination = topic_data.get('combination', 'Unknown')
-                    documents = topic_data.get('documents', [])
-                elif isinstance(topic_data, str):
-                    content = topic_data
-                    combination = 'Unknown'
-                    documents = []
-                else:
+        
+        # Values repeated on every topic of the file share one string object
+        source_url = data.get('source_url', 'Unknown')
+        if isinstance(source_url, str):
+            source_url = sys.intern(source_url)
+        json_file = sys.intern(json_file)
+        date_key = self._file_dates.get(json_file) or self._extract_date_from_filename(json_file)
+        topics = data.get('topics', {})
+        parsed: List[List[EETopicItem]] = []
+        
+        for task_key, (default_word_count, topic_type, has_documents) in self.TASK_SPECS.items():
+            task_topics: List[EETopicItem] = []
+            for topic_data in topics.get(task_key, []):
+                handler = _TOPIC_HANDLERS.get(type(topic_data))
+                if handler is None:
                     continue
+                content, combination, word_count, documents = handler(topic_data, default_word_count, has_documents)
                 
                 cleaned_content = self._clean_topic_content(content)
-                if cleaned_content and not self._is_duplicate_content(cleaned_content, json_file):
-                    topic_item = EETopicItem(
+                if cleaned_content:
+                    task_topics.append(EETopicItem(
                         content=cleaned_content,
                         source_url=source_url,
                         source_file=json_file,
-                        task='tache_3',
-                        word_count='120-180',
-                        type='texte_argumentatif',
-                        documents=documents if documents else None,
-                        combination=combination
-                    )
-                    self.task3_topics.append(topic_item)
+                        task=task_key,
+                        word_count=sys.intern(word_count) if isinstance(word_count, str) else word_count,
+                        type=topic_type,
+                        documents=documents,
+                        combination=combination,
+                        date_key=date_key
+                    ))
+            parsed.append(task_topics)
+        
+        task1_topics, task2_topics, task3_topics = parsed
+        return task1_topics, task2_topics, task3_topics
+    
+    def _process_json_file(self, json_file: str,
+                           parsed: Tuple[List[EETopicItem], List[EETopicItem], List[EETopicItem]]) -> None:
+        """
+        Add the parsed topics of a single Expression Écrite JSON file, skipping duplicates
+        """
+        self._info(f"📄 Processing: {json_file}")
+        
+        file_topic_count = 0
+        source_lists = self._by_source.setdefault(json_file, ([], [], []))
+        for topic_list, source_list, candidates in zip((self.task1_topics, self.task2_topics, self.task3_topics),
+                                                       source_lists, parsed):
+            for topic_item in candidates:
+                if not self._is_duplicate_content(topic_item.content, json_file):
+                    topic_list.append(topic_item)
+                    source_list.append(topic_item)
                     file_topic_count += 1
-            
-            self.files_processed.append(json_file)
-            self.total_topics_found += file_topic_count
-            print(f"   ✅ Extracted {file_topic_count} topics")
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {json_file}: {e}")
+        
+        self.files_processed.append(json_file)
+        self.total_topics_found += file_topic_count
+        self._info(f"   ✅ Extracted {file_topic_count} topics")
     
     def _clean_topic_content(self, content: str) -> Optional[str]:
         """
@@ -317,72 +454,44 @@ class TCFExpressionEcriteParser:
         if len(content) < 15:
             return None
         
-        # Skip specific non-topic prefixes for Expression Écrite
-        starts_with_blacklist = [
-            'AccueilSe connecter',
-            'Nous utilisons des cookies',
-            'Nos Contacts',
-            '🎯 Nouveau Service Exceptionnel',
-            'Sujets d\'actualité corrigés pour',
-            'les méthodologiesCompréhension',
-            'Les méthodologiesCompréhension',
-            'Partager avec votre réseau',
-            'Combinaison',
-            'Tâche 1',
-            'Tâche 2', 
-            'Tâche 3',
-            'Document 1',
-            'Document 2',
-            'mots minimum',
-            'mots maximum',
-            '/* <![CDATA[ */ var ldVars =',
-            '/* <![CDATA[ */ var ldVars =',
-            '/* <![CDATA['
-        ]
-        for prefix in starts_with_blacklist:
-            if content.startswith(prefix):
-                return None
-        
-        # Skip content that looks like navigation menus or metadata
-        navigation_keywords = [
-            'AccueilSe connecter', 'Compréhension écrite', 'Expression Orale',
-            'Nos Formations', 'Cabinet d\'immigration', 'Contactez-nous',
-            'Politique de retour', 'Mentions Légales', 'les pagesActualité',
-            'Les pages', 'Nous acceptons', 'Paiment', 'Cliquez ici'
-        ]
-        
-        for keyword in navigation_keywords:
-            if keyword in content:
-                return None
-        
-        # Skip content that contains too many navigation-like elements
-        if content.count('Compréhension') > 1 or content.count('Expression') > 1:
+        # Skip specific non-topic prefixes for Expression Écrite and content that
+        # looks like navigation menus or metadata
+        if _is_non_topic(content):
             return None
         
-        # Skip very long content that looks like concatenated menus/navigation
-        if len(content) > 800 and any(nav in content for nav in navigation_keywords):
+        # Skip content that contains too many navigation-like elements
+        # (long concatenated menus are already caught by the keyword screen above)
+        if _repeats_section_word(content):
             return None
         
         return content.strip()
     
+    def _info(self, message: str) -> None:
+        """
+        Log a progress message unless the parser is quiet
+        """
+        if not self.quiet:
+            logger.info(message)
+    
     def _print_summary(self) -> None:
         """
-        Print a summary of the parsing results
+        Log a summary of the parsing results (as a single message)
         """
-        print(f"\n{'='*60}")
-        print("EXPRESSION ÉCRITE PARSING SUMMARY")
-        print(f"{'='*60}")
-        print(f"📁 Files processed: {len(self.files_processed)}")
-        print(f"📊 Total topics found: {self.total_topics_found}")
-        print(f"🔄 Duplicates removed: {self.duplicates_removed}")
-        print(f"✅ Unique topics kept: {len(self.task1_topics) + len(self.task2_topics) + len(self.task3_topics)}")
-        print(f"🎯 Task 1 topics: {len(self.task1_topics)}")
-        print(f"🎯 Task 2 topics: {len(self.task2_topics)}")
-        print(f"🎯 Task 3 topics: {len(self.task3_topics)}")
-        
-        print(f"\n📋 Files processed:")
-        for file in self.files_processed:
-            print(f"   - {file}")
+        lines = [
+            f"\n{'='*60}",
+            "EXPRESSION ÉCRITE PARSING SUMMARY",
+            f"{'='*60}",
+            f"📁 Files processed: {len(self.files_processed)}",
+            f"📊 Total topics found: {self.total_topics_found}",
+            f"🔄 Duplicates removed: {self.duplicates_removed}",
+            f"✅ Unique topics kept: {len(self.task1_topics) + len(self.task2_topics) + len(self.task3_topics)}",
+            f"🎯 Task 1 topics: {len(self.task1_topics)}",
+            f"🎯 Task 2 topics: {len(self.task2_topics)}",
+            f"🎯 Task 3 topics: {len(self.task3_topics)}",
+            f"\n📋 Files processed:",
+        ]
+        lines.extend(f"   - {file}" for file in self.files_processed)
+        self._info("\n".join(lines))
     
     def get_task1_topics(self) -> List[EETopicItem]:
         """Get all Task 1 topics"""
@@ -398,81 +507,53 @@ class TCFExpressionEcriteParser:
     
     def get_topics_by_source(self, source_file: str) -> Tuple[List[EETopicItem], List[EETopicItem], List[EETopicItem]]:
         """
-        Get topics from a specific source file
+        Get topics from a specific source file (looked up in the index built while loading)
         """
-        task1 = [topic for topic in self.task1_topics if topic.source_file == source_file]
-        task2 = [topic for topic in self.task2_topics if topic.source_file == source_file]
-        task3 = [topic for topic in self.task3_topics if topic.source_file == source_file]
-        return task1, task2, task3
+        return self._by_source.get(source_file) or ([], [], [])
     
     def get_topics_by_task(self, task: str) -> List[EETopicItem]:
         """
         Get topics from a specific task
         """
-        if task == 'tache_1':
-            return self.task1_topics
-        elif task == 'tache_2':
-            return self.task2_topics
-        elif task == 'tache_3':
-            return self.task3_topics
-        else:
-            return []
+        return self._task_map.get(task, [])
     
     def export_organized_topics(self, output_file: str = "organized_ee_topics.json") -> None:
         """
         Export the organized Expression Écrite topics to a new JSON file
+        
+        Topics are serialized and written one at a time, so the whole document is
+        never held in memory; the output is the same as dumping it with indent=2.
         """
-        organized_data = {
-            "summary": {
-                "total_files_processed": len(self.files_processed),
-                "total_topics": self.total_topics_found,
-                "task1_topics_count": len(self.task1_topics),
-                "task2_topics_count": len(self.task2_topics),
-                "task3_topics_count": len(self.task3_topics),
-                "files_processed": self.files_processed
-            },
-            "task1_topics": [
-                {
-                    "content": topic.content,
-                    "source_url": topic.source_url,
-                    "source_file": topic.source_file,
-                    "task": topic.task,
-                    "word_count": topic.word_count,
-                    "type": topic.type,
-                    "combination": topic.combination
-                }
-                for topic in self.task1_topics
-            ],
-            "task2_topics": [
-                {
-                    "content": topic.content,
-                    "source_url": topic.source_url,
-                    "source_file": topic.source_file,
-                    "task": topic.task,
-                    "word_count": topic.word_count,
-                    "type": topic.type,
-                    "combination": topic.combination
-                }
-                for topic in self.task2_topics
-            ],
-            "task3_topics": [
-                {
-                    "content": topic.content,
-                    "source_url": topic.source_url,
-                    "source_file": topic.source_file,
-                    "task": topic.task,
-                    "word_count": topic.word_count,
-                    "type": topic.type,
-                    "documents": topic.documents,
-                    "combination": topic.combination
-                }
-                for topic in self.task3_topics
-            ]
+        summary = {
+            "total_files_processed": len(self.files_processed),
+            "total_topics": self.total_topics_found,
+            "task1_topics_count": len(self.task1_topics),
+            "task2_topics_count": len(self.task2_topics),
+            "task3_topics_count": len(self.task3_topics),
+            "files_processed": self.files_processed
         }
+        sections = (
+            ("task1_topics", self.task1_topics, EXPORT_FIELDS, _get_export_fields),
+            ("task2_topics", self.task2_topics, EXPORT_FIELDS, _get_export_fields),
+            ("task3_topics", self.task3_topics, EXPORT_FIELDS_WITH_DOCUMENTS, _get_export_fields_with_documents),
+        )
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(organized_data, f, ensure_ascii=False, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(b'{\n  "summary": ' + _dumps(summary).replace(b'\n', b'\n  '))
+                for key, topics, field_names, get_fields in sections:
+                    f.write(b',\n  "' + key.encode('utf-8') + b'": ')
+                    if not topics:
+                        f.write(b'[]')
+                        continue
+                    separator = b'[\n    '
+                    for topic in topics:
+                        item = dict(zip(field_names, get_fields(topic)))
+                        # Nested two levels deep: indent every line of the item by 4 spaces
+                        f.write(separator + _dumps(item).replace(b'\n', b'\n    '))
+                        separator = b',\n    '
+                    f.write(b'\n  ]')
+                f.write(b'\n}')
             print(f"\n✅ Organized Expression Écrite topics exported to: {output_file}")
         except Exception as e:
             print(f"\n❌ Error exporting topics: {e}")
@@ -534,6 +615,7 @@ def main():
     """
     Main function to demonstrate the Expression Écrite parser
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("🚀 Starting TCF Expression Écrite Topics Parser...")
     
     # Initialize parser
@@ -1,11 +1,61 @@
 import json
 import os
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from functools import lru_cache, partial
+from operator import attrgetter
+from typing import List, Dict, Tuple, Optional, Callable
+from dataclasses import dataclass, field
 from datetime import datetime
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-@dataclass
+try:
+    import orjson  # optional: faster JSON parsing and export
+except ImportError:
+    orjson = None
+
+# French month names to numbers mapping
+FRENCH_MONTHS = {
+    'janvier': 1, 'fevrier': 2, 'mars': 3, 'avril': 4,
+    'mai': 5, 'juin': 6, 'juillet': 7, 'aout': 8,
+    'septembre': 9, 'octobre': 10, 'novembre': 11, 'decembre': 12
+}
+MONTH_NAMES = {number: name for name, number in FRENCH_MONTHS.items()}
+
+# Worker processes cost tens of milliseconds to start; below these sizes parsing
+# in-process is faster
+PARALLEL_MIN_FILES = 8
+PARALLEL_MIN_BYTES = 4 << 20
+
+# Leading 'Partie <number>' prefix (e.g., 'Partie 7', 'partie 12:')
+_PARTIE_PREFIX = re.compile(r'^partie\s*\d+\s*[:\-–—]*\s*', re.IGNORECASE)
+_PARTIE_MATCH = re.compile(r'^Partie\s+(\d+)', re.IGNORECASE)
+
+# Non-topic prefixes scraped from Expression Orale pages
+BLACKLIST_PREFIXES = (
+    'AccueilSe connecter',
+    'Nous utilisons des cookies',
+    'Nos Contacts',
+    '🎯 Nouveau Service Exceptionnel',
+    'Sujets d\'actualité corrigés pour',
+    'les méthodologiesCompréhension',
+    'Les méthodologiesCompréhension',
+    'Partager avec votre réseau'
+)
+
+# Keywords that mark navigation menus rather than topics
+NAVIGATION_KEYWORDS = (
+    'AccueilSe connecter', 'Compréhension écrite', 'Expression Orale',
+    'Nos Formations', 'Cabinet d\'immigration', 'Contactez-nous',
+    'Politique de retour', 'Mentions Légales'
+)
+_NAV_RE = re.compile('|'.join(map(re.escape, NAVIGATION_KEYWORDS)))
+
+# Exported topic fields, in output order
+EXPORT_FIELDS = ('content', 'source_url', 'source_file', 'part', 'part_number')
+_get_export_fields = attrgetter(*EXPORT_FIELDS)
+
+@dataclass(slots=True, frozen=True)
 class TopicItem:
     """
     Data class to represent a single topic with metadata
@@ -16,17 +66,155 @@ class TopicItem:
     task: str  # 'tache_2' or 'tache_3'
     part: str  # 'partie_1', 'partie_2', etc.
     part_number: int
+    date_key: Tuple[int, int] = field(default=(1900, 1), repr=False, compare=False)  # (year, month) of source_file
+
+@lru_cache(maxsize=None)
+def _parse_filename_date(filename: str) -> Tuple[int, int]:
+    """
+    Extract (year, month) from a 'month-year-expression-orale.json' filename
+    """
+    # Remove the .json extension and split by hyphens
+    base_name = filename.replace('.json', '')
+    parts = base_name.split('-')
+    
+    if len(parts) >= 2:
+        month_name = parts[0].lower()
+        year_str = parts[1]
+        
+        if month_name in FRENCH_MONTHS and year_str.isdecimal():
+            year = int(year_str)
+            month = FRENCH_MONTHS[month_name]
+            return (year, month)
+    
+    # If parsing fails, return a default date (very old)
+    return (1900, 1)
+
+def _topic_sort_key(topic: TopicItem) -> Tuple[int, int, int]:
+    """
+    Sort key for topics: newest source file first, then by part number
+    """
+    year, month = topic.date_key
+    return (-year, -month, topic.part_number)  # Negative for reverse order
+
+def _extract_part_number(part_name: str) -> int:
+    """
+    Extract the part number from part name (e.g., 'partie_1' -> 1)
+    """
+    start = part_name.find('_') + 1
+    if not start:
+        return 0
+    end = part_name.find('_', start)
+    number = part_name[start:end] if end >= 0 else part_name[start:]
+    # isdecimal() accepts exactly the digit strings int() can parse
+    return int(number) if number.isdecimal() else 0
+
+def _clean_topic_content(content: str) -> Optional[str]:
+    """
+    Clean and validate topic content
+    """
+    if not content or not isinstance(content, str) or len(content) < 10:
+        return None
+    
+    # Cheap rejects on the raw text first: collapsing whitespace and stripping the
+    # Partie prefix only shorten it and never change a blacklisted start
+    if content.startswith(BLACKLIST_PREFIXES):
+        return None
+    
+    # Remove excessive whitespace
+    content = ' '.join(content.split())
+    
+    # Strip leading 'Partie <number>' prefix if present (e.g., 'Partie 7', 'partie 12:')
+    content = _PARTIE_PREFIX.sub('', content)
+    
+    # Skip very short content or navigation/menu items
+    if len(content) < 10:
+        return None
+    
+    # Skip specific non-topic prefixes
+    if content.startswith(BLACKLIST_PREFIXES):
+        return None
+    
+    # Skip content that looks like navigation menus
+    if _NAV_RE.search(content):
+        return None
+    
+    # Strip a second leading 'Partie <number>' case-insensitively (stacked headers)
+    match = _PARTIE_MATCH.match(content)
+    if match:
+        content = content[len(match.group(0)):]
+    
+    # Skip content that starts with "Partie X" (these are usually concatenated headers)
+    if content.startswith('Partie ') and len(content) > 500:
+        return None
+    
+    return content.strip()
+
+def _parse_one(file_path: str) -> Tuple[List[TopicItem], List[TopicItem]]:
+    """
+    Read one JSON file and return its cleaned (task2_topics, task3_topics)
+    
+    Depends only on its argument, so it can run in a worker process.
+    """
+    json_file = os.path.basename(file_path)
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    source_url = data.get('source_url', 'Unknown')
+    topics = data.get('topics', {})
+    date_key = _parse_filename_date(json_file)
+    
+    task2_topics: List[TopicItem] = []
+    task3_topics: List[TopicItem] = []
+    
+    # Local aliases keep attribute and global lookups out of the inner loop
+    clean = _clean_topic_content
+    part_num = _extract_part_number
+    TI = TopicItem
+    
+    def handle(task_name: str, dest_append) -> None:
+        """
+        Clean the topics of one task and add the non-empty ones via dest_append
+        """
+        for part_name, part_topics in topics.get(task_name, {}).items():
+            part_number = part_num(part_name)
+            for topic_content in part_topics:
+                cleaned_content = clean(topic_content)
+                if cleaned_content:  # Only add non-empty topics
+                    dest_append(TI(cleaned_content, source_url, json_file, task_name,
+                                   part_name, part_number, date_key))
+    
+    handle('tache_2', task2_topics.append)
+    handle('tache_3', task3_topics.append)
+    
+    return task2_topics, task3_topics
+
+def _dumps(obj, pretty: bool = True) -> bytes:
+    """
+    Serialize to UTF-8 JSON, indented by 2 spaces or compact (orjson when available)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    # Without indent the stdlib uses its C encoder
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 class TCFTopicsParser:
     """
     Parser to read and organize TCF Canada topics from JSON files
     """
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", verbose: bool = False):
         """
         Initialize the parser with the output directory containing JSON files
+        
+        verbose=True also reports per-file progress; errors are always reported.
+        Messages are buffered and written once at the end of load_all_topics().
         """
         self.output_dir = output_dir
+        self.verbose = verbose
+        self._log: List[str] = []
         self.task2_topics: List[TopicItem] = []
         self.task3_topics: List[TopicItem] = []
         self.files_processed: List[str] = []
@@ -37,32 +225,40 @@ class TCFTopicsParser:
         Load all topics from JSON files in the output directory
         Returns: (task2_topics, task3_topics)
         """
-        print(f"🔍 Scanning directory: {self.output_dir}")
+        self._progress(f"🔍 Scanning directory: {self.output_dir}")
         
-        # Get all JSON files in the output directory
-        json_files = [f for f in os.listdir(self.output_dir) if f.endswith('.json')]
+        # Get all JSON files in the output directory (with their full paths)
+        with os.scandir(self.output_dir) as entries:
+            json_entries = [entry for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+        file_paths = {entry.name: entry.path for entry in json_entries}
+        json_files = list(file_paths)
         
         if not json_files:
-            print(f"❌ No JSON files found in {self.output_dir}")
+            self._log.append(f"❌ No JSON files found in {self.output_dir}")
+            self._flush_log()
             return self.task2_topics, self.task3_topics
         
         # Sort files by date (newest to oldest)
         json_files_sorted = self._sort_files_by_date(json_files)
         
-        print(f"📁 Found {len(json_files_sorted)} JSON files (sorted by date - newest to oldest)")
+        self._progress(f"📁 Found {len(json_files_sorted)} JSON files (sorted by date - newest to oldest)")
         
-        # Process each JSON file in chronological order
-        for json_file in json_files_sorted:
-            self._process_json_file(json_file)
+        # Parse files in worker processes only when the corpus is large enough to repay
+        # starting them; either way results are collected in chronological order
+        paths = [file_paths[json_file] for json_file in json_files_sorted]
+        workers = min(len(paths), os.cpu_count() or 1)
+        total_bytes = sum(entry.stat().st_size for entry in json_entries)
+        if workers > 1 and len(paths) >= PARALLEL_MIN_FILES and total_bytes >= PARALLEL_MIN_BYTES:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_parse_one, path) for path in paths]
+                self._collect_parsed(json_files_sorted, [future.result for future in futures])
+        else:
+            self._collect_parsed(json_files_sorted, [partial(_parse_one, path) for path in paths])
+        self._flush_log()
         
         # Sort topics by chronological order (newest first), then by part number
-        def sort_key(topic):
-            # Extract date from source_file for sorting
-            year, month = self._extract_date_from_filename(topic.source_file)
-            return (-year, -month, topic.part_number)  # Negative for reverse order
-        
-        self.task2_topics.sort(key=sort_key)
-        self.task3_topics.sort(key=sort_key)
+        self.task2_topics.sort(key=_topic_sort_key)
+        self.task3_topics.sort(key=_topic_sort_key)
         
         self._print_summary()
         
@@ -73,203 +269,68 @@ class TCFTopicsParser:
         Sort JSON files by date from newest to oldest
         Expected format: month-year-expression-orale.json
         """
-        # French month names to numbers mapping
-        french_months = {
-            'janvier': 1, 'fevrier': 2, 'mars': 3, 'avril': 4,
-            'mai': 5, 'juin': 6, 'juillet': 7, 'aout': 8,
-            'septembre': 9, 'octobre': 10, 'novembre': 11, 'decembre': 12
-        }
-        
-        def extract_date(filename: str) -> Tuple[int, int]:
-            """
-            Extract year and month from filename
-            Returns: (year, month) tuple for sorting
-            """
-            try:
-                # Remove the .json extension and split by hyphens
-                base_name = filename.replace('.json', '')
-                parts = base_name.split('-')
-                
-                if len(parts) >= 2:
-                    month_name = parts[0].lower()
-                    year_str = parts[1]
-                    
-                    if month_name in french_months and year_str.isdigit():
-                        year = int(year_str)
-                        month = french_months[month_name]
-                        return (year, month)
-            except:
-                pass
-            
-            # If parsing fails, return a default date (very old)
-            return (1900, 1)
-        
         # Sort by date (newest first)
-        sorted_files = sorted(json_files, key=extract_date, reverse=True)
+        sorted_files = sorted(json_files, key=_parse_filename_date, reverse=True)
         
-        # Print the sorted order for verification
-        print("📅 Files sorted by date (newest to oldest):")
-        for i, filename in enumerate(sorted_files, 1):
-            year, month = extract_date(filename)
-            month_names = {v: k for k, v in french_months.items()}
-            month_name = month_names.get(month, 'unknown')
-            print(f"   {i:2d}. {filename} ({month_name.capitalize()} {year})")
+        # List the sorted order for verification
+        if self.verbose:
+            self._progress("📅 Files sorted by date (newest to oldest):")
+            for i, filename in enumerate(sorted_files, 1):
+                year, month = _parse_filename_date(filename)
+                month_name = MONTH_NAMES.get(month, 'unknown')
+                self._progress(f"   {i:2d}. {filename} ({month_name.capitalize()} {year})")
         
         return sorted_files
     
-    def _extract_date_from_filename(self, filename: str) -> Tuple[int, int]:
+    @staticmethod
+    def _extract_date_from_filename(filename: str) -> Tuple[int, int]:
         """
         Extract year and month from filename for sorting
         """
-        french_months = {
-            'janvier': 1, 'fevrier': 2, 'mars': 3, 'avril': 4,
-            'mai': 5, 'juin': 6, 'juillet': 7, 'aout': 8,
-            'septembre': 9, 'octobre': 10, 'novembre': 11, 'decembre': 12
-        }
-        
-        try:
-            base_name = filename.replace('.json', '')
-            parts = base_name.split('-')
-            
-            if len(parts) >= 2:
-                month_name = parts[0].lower()
-                year_str = parts[1]
-                
-                if month_name in french_months and year_str.isdigit():
-                    year = int(year_str)
-                    month = french_months[month_name]
-                    return (year, month)
-        except:
-            pass
-        
-        return (1900, 1)  # Default for unparseable filenames
+        return _parse_filename_date(filename)
     
-    def _process_json_file(self, json_file: str) -> None:
+    def _collect_parsed(self, json_files: List[str],
+                        results: List[Callable[[], Tuple[List[TopicItem], List[TopicItem]]]]) -> None:
         """
-        Process a single JSON file and extract topics
+        Record each file's parse result in order (results[i]() parses or awaits json_files[i])
         """
-        file_path = os.path.join(self.output_dir, json_file)
+        for json_file, result in zip(json_files, results):
+            self._progress(f"📄 Processing: {json_file}")
+            try:
+                parsed = result()
+            except Exception as e:
+                self._log.append(f"   ❌ Error processing {json_file}: {e}")
+                continue
+            self._process_json_file(json_file, parsed)
+    
+    def _process_json_file(self, json_file: str, parsed: Tuple[List[TopicItem], List[TopicItem]]) -> None:
+        """
+        Record the topics parsed from a single JSON file
+        """
+        task2_topics, task3_topics = parsed
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            print(f"📄 Processing: {json_file}")
-            
-            source_url = data.get('source_url', 'Unknown')
-            topics = data.get('topics', {})
-            
-            file_topic_count = 0
-            
-            # Process Task 2 topics
-            tache_2 = topics.get('tache_2', {})
-            for part_name, part_topics in tache_2.items():
-                part_number = self._extract_part_number(part_name)
-                for topic_content in part_topics:
-                    # Clean up the topic content
-                    cleaned_content = self._clean_topic_content(topic_content)
-                    if cleaned_content:  # Only add non-empty topics
-                        topic_item = TopicItem(
-                            content=cleaned_content,
-                            source_url=source_url,
-                            source_file=json_file,
-                            task='tache_2',
-                            part=part_name,
-                            part_number=part_number
-                        )
-                        self.task2_topics.append(topic_item)
-                        file_topic_count += 1
-            
-            # Process Task 3 topics
-            tache_3 = topics.get('tache_3', {})
-            for part_name, part_topics in tache_3.items():
-                part_number = self._extract_part_number(part_name)
-                for topic_content in part_topics:
-                    # Clean up the topic content
-                    cleaned_content = self._clean_topic_content(topic_content)
-                    if cleaned_content:  # Only add non-empty topics
-                        topic_item = TopicItem(
-                            content=cleaned_content,
-                            source_url=source_url,
-                            source_file=json_file,
-                            task='tache_3',
-                            part=part_name,
-                            part_number=part_number
-                        )
-                        self.task3_topics.append(topic_item)
-                        file_topic_count += 1
-            
-            self.files_processed.append(json_file)
-            self.total_topics_found += file_topic_count
-            print(f"   ✅ Extracted {file_topic_count} topics")
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {json_file}: {e}")
+        self.task2_topics.extend(task2_topics)
+        self.task3_topics.extend(task3_topics)
+        file_topic_count = len(task2_topics) + len(task3_topics)
+        
+        self.files_processed.append(json_file)
+        self.total_topics_found += file_topic_count
+        self._progress(f"   ✅ Extracted {file_topic_count} topics")
     
-    def _extract_part_number(self, part_name: str) -> int:
+    def _progress(self, message: str) -> None:
         """
-        Extract the part number from part name (e.g., 'partie_1' -> 1)
+        Buffer a progress message if the parser is verbose
         """
-        try:
-            if '_' in part_name:
-                return int(part_name.split('_')[1])
-            return 0
-        except:
-            return 0
+        if self.verbose:
+            self._log.append(message)
     
-    def _clean_topic_content(self, content: str) -> Optional[str]:
+    def _flush_log(self) -> None:
         """
-        Clean and validate topic content
+        Write all buffered messages to stdout in a single call
         """
-        if not content or not isinstance(content, str):
-            return None
-        
-        # Remove excessive whitespace
-        content = ' '.join(content.split())
-        
-        # Strip leading 'Partie <number>' prefix if present (e.g., 'Partie 7', 'partie 12:')
-        content = re.sub(r'^partie\s*\d+\s*[:\-–—]*\s*', '', content, flags=re.IGNORECASE)
-        
-        # Skip very short content or navigation/menu items
-        if len(content) < 10:
-            return None
-        
-        # Skip specific non-topic prefixes
-        starts_with_blacklist = [
-            'AccueilSe connecter',
-            'Nous utilisons des cookies',
-            'Nos Contacts',
-            '🎯 Nouveau Service Exceptionnel',
-            'Sujets d\'actualité corrigés pour',
-            'les méthodologiesCompréhension',
-            'Les méthodologiesCompréhension',
-            'Partager avec votre réseau'
-        ]
-        for prefix in starts_with_blacklist:
-            if content.startswith(prefix):
-                return None
-        
-        # Skip content that looks like navigation menus
-        navigation_keywords = [
-            'AccueilSe connecter', 'Compréhension écrite', 'Expression Orale',
-            'Nos Formations', 'Cabinet d\'immigration', 'Contactez-nous',
-            'Politique de retour', 'Mentions Légales'
-        ]
-        
-        for keyword in navigation_keywords:
-            if keyword in content:
-                return None
-        
-        # Strip leading 'Partie <number>' prefix case-insensitively
-        match = re.match(r'^Partie\s+(\d+)', content, re.IGNORECASE)
-        if match:
-            content = content[len(match.group(0)):]
-        
-        # Skip content that starts with "Partie X" (these are usually concatenated headers)
-        if content.startswith('Partie ') and len(content) > 500:
-            return None
-        
-        return content.strip()
+        if self._log:
+            sys.stdout.write('\n'.join(self._log) + '\n')
+            self._log.clear()
     
     def _print_summary(self) -> None:
         """
@@ -314,43 +375,46 @@ class TCFTopicsParser:
         topics_list = self.task2_topics if task == 'tache_2' else self.task3_topics
         return [topic for topic in topics_list if topic.part_number == part_number]
     
-    def export_organized_topics(self, output_file: str = "organized_topics.json") -> None:
+    def export_organized_topics(self, output_file: str = "organized_topics.json", pretty: bool = True) -> None:
         """
         Export the organized topics to a new JSON file
+        
+        Topics are serialized and written one at a time, so the whole document is
+        never held in memory; the output is the same as dumping it with indent=2,
+        or compact (much faster without orjson) with pretty=False.
         """
-        organized_data = {
-            "summary": {
-                "total_files_processed": len(self.files_processed),
-                "total_topics": self.total_topics_found,
-                "task2_topics_count": len(self.task2_topics),
-                "task3_topics_count": len(self.task3_topics),
-                "files_processed": self.files_processed
-            },
-            "task2_topics": [
-                {
-                    "content": topic.content,
-                    "source_url": topic.source_url,
-                    "source_file": topic.source_file,
-                    "part": topic.part,
-                    "part_number": topic.part_number
-                }
-                for topic in self.task2_topics
-            ],
-            "task3_topics": [
-                {
-                    "content": topic.content,
-                    "source_url": topic.source_url,
-                    "source_file": topic.source_file,
-                    "part": topic.part,
-                    "part_number": topic.part_number
-                }
-                for topic in self.task3_topics
-            ]
+        summary = {
+            "total_files_processed": len(self.files_processed),
+            "total_topics": self.total_topics_found,
+            "task2_topics_count": len(self.task2_topics),
+            "task3_topics_count": len(self.task3_topics),
+            "files_processed": self.files_processed
         }
+        sections = (
+            ("task2_topics", self.task2_topics),
+            ("task3_topics", self.task3_topics),
+        )
+        # Line break + indent before top-level keys and before list items
+        key_break, item_break = (b'\n  ', b'\n    ') if pretty else (b'', b'')
+        colon = b': ' if pretty else b':'
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(organized_data, f, ensure_ascii=False, indent=2)
+            # Many small writes follow; a larger buffer batches them
+            with open(output_file, 'wb', buffering=1 << 16) as f:
+                f.write(b'{' + key_break + b'"summary"' + colon + _dumps(summary, pretty).replace(b'\n', key_break))
+                for key, topics in sections:
+                    f.write(b',' + key_break + b'"' + key.encode('utf-8') + b'"' + colon)
+                    if not topics:
+                        f.write(b'[]')
+                        continue
+                    separator = b'[' + item_break
+                    for topic in topics:
+                        item = dict(zip(EXPORT_FIELDS, _get_export_fields(topic)))
+                        # Nested two levels deep: indent every line of the item by 4 spaces
+                        f.write(separator + _dumps(item, pretty).replace(b'\n', item_break))
+                        separator = b',' + item_break
+                    f.write(key_break + b']')
+                f.write(b'\n}' if pretty else b'}')
             print(f"\n✅ Organized topics exported to: {output_file}")
         except Exception as e:
             print(f"\n❌ Error exporting topics: {e}")
@@ -383,7 +447,7 @@ def main():
     print("🚀 Starting TCF Topics Parser...")
     
     # Initialize parser
-    parser = TCFTopicsParser(output_dir="output")
+    parser = TCFTopicsParser(output_dir="output", verbose=True)
     
     # Load all topics
     task2_topics, task3_topics = parser.load_all_topics()